@@ -14,6 +14,9 @@ import bpy
 import re
 import logging
 import json # <-- persistent mapping
+from bisect import bisect_right
+from functools import lru_cache
+from operator import attrgetter
 from bpy.props import StringProperty, BoolProperty
 from bpy.app.handlers import persistent
 
@@ -22,10 +25,31 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 log = logging.getLogger(__name__)
 
+# --- Naming Patterns ---
+# Compiled once at import; these run against every marker/collection on
+# cache rebuilds, shot changes and context-menu redraws.
+SHOT_ID_PATTERN = re.compile(r"(SC\d+-SH\d+)", re.IGNORECASE)
+SHOT_MARKER_PATTERN = re.compile(r"CAM-(SC\d+-SH\d+)", re.IGNORECASE)
+SHOT_COLLECTION_PATTERN = re.compile(r"^(MODEL|CAM|VFX|PRP)-SC\d+-SH\d+$", re.IGNORECASE)
+PREFIXED_SHOT_COLLECTION_PATTERNS = {
+    prefix: re.compile(rf"^{prefix}-SC\d+-SH\d+$", re.IGNORECASE)
+    for prefix in ("MODEL", "PRP", "VFX")
+}
+PROJECT_SCENE_PATTERN = re.compile(r"^SC\d+-.*", re.IGNORECASE)
+SCENE_NUMBER_PATTERN = re.compile(r"^(SC\d+)", re.IGNORECASE)
+SHOT_BUILD_PREFIXES = ("+SC", "+ART", "+ANI", "+VFX")
+ENV_SOURCE_PREFIXES = ("MODEL-ENV", "VFX-ENV", "PRP-ENV")
+LOC_SOURCE_PREFIXES = ("MODEL-LOC", "VFX-LOC", "PRP-LOC")
+SUPPORTED_ID_TYPES = frozenset({"COLLECTION", "OBJECT"})
+SELECTED_IDS_AREA_TYPES = frozenset({"OUTLINER", "FILE_BROWSER"})
+
 
 # --- NEW: Persistent Copy Map Helpers (Phase 1) ---
 
 KRUTART_VISIBILITY_MAP_NAME = "__krutart_copy_map.json"
+# Last JSON text seen by load/save_copy_map and its parsed dict, so the
+# save -> build_visibility_data round trip doesn't re-parse the same text.
+copy_map_cache = {"json": None, "map": {}}
 
 def load_copy_map():
     """
@@ -40,9 +64,15 @@ def load_copy_map():
     if not json_data:
         return {}
 
+    # Callers mutate the result before saving, so always hand out a copy.
+    if json_data == copy_map_cache["json"]:
+        return dict(copy_map_cache["map"])
+
     try:
         copy_map = json.loads(json_data)
         if isinstance(copy_map, dict):
+            copy_map_cache["json"] = json_data
+            copy_map_cache["map"] = dict(copy_map)
             return copy_map
         else:
             log.warning(f"'{KRUTART_VISIBILITY_MAP_NAME}' does not contain a valid JSON object. Resetting map.")
@@ -68,6 +98,8 @@ def save_copy_map(copy_map_dict):
         
         text_block.clear()
         text_block.write(json_data)
+        copy_map_cache["json"] = json_data
+        copy_map_cache["map"] = dict(copy_map_dict)
         log.debug(f"Saved {len(copy_map_dict)} mappings to '{KRUTART_VISIBILITY_MAP_NAME}'.")
 
     except Exception as e:
@@ -79,52 +111,89 @@ def save_copy_map(copy_map_dict):
 # --- Shot Visibility Cache & Helpers ---
 # Global caches for performance.
 shot_switch_map = {} # Maps frame -> shot_id for timeline scrubbing.
+shot_switch_frames = [] # Sorted keys of shot_switch_map, so frame changes can bisect.
 # Maps shot_id -> {set of original bpy.types.Object or .Collection instances}
 originals_to_hide_map = {}
 # Cache to quickly find original items by their full name.
 # Maps full_name_str -> bpy.types.Object or .Collection
 original_items_cache = {}
+
 cached_scene_name = None # Tracks the scene the cache was built for.
 
 def get_shot_identifier(name):
     """Extracts 'SC##-SH###' from a collection or marker name."""
     if not name: return None
-    match = re.search(r"(SC\d+-SH\d+)", name, re.IGNORECASE)
+    match = SHOT_ID_PATTERN.search(name)
     return match.group(1).upper() if match else None
 
+def get_shot_collection_identifier(name):
+    """
+    get_shot_identifier() for names already matched by SHOT_COLLECTION_PATTERN
+    ('PREFIX-SC##-SH###'): the ID is everything after the prefix, so no regex is needed.
+    """
+    return name.partition("-")[2].upper()
+
+def get_shot_prefix(collection_name):
+    """Classifies a source collection name as 'MODEL', 'PRP' or 'VFX' (the fallback)."""
+    if "MODEL" in collection_name:
+        return "MODEL"
+    elif "PRP" in collection_name:
+        return "PRP"
+    return "VFX" # Keep original fallback
+
+def get_source_prefix(collection_name):
+    """
+    Classifies an ENV/LOC source collection ('MODEL-ENV...', 'PRP-LOC...', etc.) by its
+    leading tag: 'MODEL', 'PRP' or 'VFX' (the fallback). Callers have already checked the
+    name against ENV_SOURCE_PREFIXES/LOC_SOURCE_PREFIXES, so the tag is everything before the first '-'.
+    """
+    prefix = collection_name.partition("-")[0]
+    return prefix if prefix in ("MODEL", "PRP") else "VFX"
+
+@lru_cache(maxsize=32)
+def get_scene_shot_pattern(prefix, scene_prefix):
+    """
+    Returns a compiled pattern matching '<prefix>-<scene_prefix>-SH###' collection names.
+    scene_prefix is 'SC' + digits, so it is safe to embed unescaped.
+    """
+    return re.compile(rf"^{prefix}-{scene_prefix}-SH\d+$", re.IGNORECASE)
+
 # --- DELETED (Phase 4) ---
 # The problematic get_base_name function has been removed.
 # ---
 
 def get_all_shot_collections():
     """Scans the blend file for all collections matching the shot naming convention."""
-    # --- MODIFIED --- Added 'PRP' to the pattern
-    pattern = re.compile(r"^(MODEL|CAM|VFX|PRP)-SC\d+-SH\d+$", re.IGNORECASE)
-    return [c for c in bpy.data.collections if pattern.match(c.name)]
+    return [c for c in bpy.data.collections if SHOT_COLLECTION_PATTERN.match(c.name)]
 
 def _collect_all_items_recursive(collection, collected_items_set):
     """
-    Recursively collects all objects and child collections from a starting collection.
+    Collects all objects and child collections below a starting collection, at any depth.
     This is the new helper function to support deep scanning.
+    Walks the hierarchy with an explicit stack instead of recursing per level, and a
+    collection linked under several parents is only expanded once.
     """
     if not collection:
         return
 
-    try:
-        # Add all objects from this collection
-        for obj in collection.objects:
-            if obj: # Check if obj is not None
-                collected_items_set.add(obj)
-        
-        # Add all child collections and recurse
-        for child_coll in collection.children:
-            if child_coll: # Check if child_coll is not None
-                collected_items_set.add(child_coll)
-                _collect_all_items_recursive(child_coll, collected_items_set)
+    stack = [collection]
+    while stack:
+        current = stack.pop()
+        try:
+            # Add all objects from this collection
+            for obj in current.objects:
+                if obj: # Check if obj is not None
+                    collected_items_set.add(obj)
+            
+            # Add all child collections and queue them for scanning
+            for child_coll in current.children:
+                if child_coll and child_coll not in collected_items_set:
+                    collected_items_set.add(child_coll)
+                    stack.append(child_coll)
 
-    except ReferenceError:
-        # This can happen if a collection is deleted mid-operation
-        log.warning(f"ReferenceError while scanning collection '{collection.name}'. It may be broken or deleted.")
+        except ReferenceError:
+            # This can happen if a collection is deleted mid-operation
+            log.warning(f"ReferenceError while scanning collection '{current.name}'. It may be broken or deleted.")
 
 
 @persistent
@@ -139,17 +208,19 @@ def build_visibility_data(scene):
     
     # --- Part 1: Build Shot Switch Map (existing logic, unchanged) ---
     shot_switch_map.clear()
+    shot_switch_frames.clear()
     if not scene or not hasattr(scene, 'timeline_markers'):
         log.warning("build_visibility_data: Called with an invalid scene.")
         cached_scene_name = None
         return
 
-    marker_pattern = re.compile(r"CAM-SC\d+-SH\d+", re.IGNORECASE)
-    shot_markers = [m for m in scene.timeline_markers if marker_pattern.match(m.name)]
-    for marker in shot_markers:
-        shot_id = get_shot_identifier(marker.name)
-        if shot_id:
-            shot_switch_map[marker.frame] = shot_id
+    # The marker pattern captures the 'SC##-SH###' part itself, so each name is
+    # matched once instead of being filtered and then searched again for the ID.
+    for marker in scene.timeline_markers:
+        match = SHOT_MARKER_PATTERN.match(marker.name)
+        if match:
+            shot_switch_map[marker.frame] = match.group(1).upper()
+    shot_switch_frames.extend(sorted(shot_switch_map))
     cached_scene_name = scene.name
     log.info(f"Shot cache rebuilt for scene '{scene.name}'. Found {len(shot_switch_map)} switch frames.")
 
@@ -178,9 +249,7 @@ def build_visibility_data(scene):
 
     # 3. Scan shot collections and map them to originals using our new map
     for shot_coll in get_all_shot_collections():
-        coll_shot_id = get_shot_identifier(shot_coll.name)
-        if not coll_shot_id:
-            continue
+        coll_shot_id = get_shot_collection_identifier(shot_coll.name)
         
         # Recursively find ALL items within this shot collection hierarchy.
         all_items_in_shot = set()
@@ -216,27 +285,30 @@ def build_visibility_data_on_load(dummy):
 
 # --- Dynamic Collection Visibility Handler ---
 
-def set_item_visibility(view_layer, item, visible):
+def set_item_visibility(view_layer, item, visible, layer_index=None):
     """
     Sets the visibility for an object or a collection within a specific view layer.
     This is safer than directly manipulating properties and handles different data types.
+    Returns True if the item still exists and was processed, so callers needn't re-check it.
+    Callers toggling many items should pass layer_index from build_original_layer_collection_index().
     """
-    if not item: return
+    if not item: return False
 
     try:
         item_name = item.name
     except (ReferenceError, RuntimeError):
         # Item has been completely purged from memory (e.g. by Butcher)
         log.debug("Skipped visibility set: Item was deleted and is no longer valid.")
-        return
+        return False
 
     try:
-        # Check if item still exists
-        if item_name not in bpy.data.objects and item_name not in bpy.data.collections:
+        # Check if item still exists (only in the bpy.data collection matching its type)
+        is_object = isinstance(item, bpy.types.Object)
+        if item_name not in (bpy.data.objects if is_object else bpy.data.collections):
             log.warning(f"Could not set visibility for '{item_name}'. It may no longer exist.")
-            return
+            return False
             
-        if isinstance(item, bpy.types.Object):
+        if is_object:
             # Use hide_set() for objects, as it's the modern, correct method.
             if item.hide_get() == visible:
                 item.hide_set(not visible)
@@ -245,7 +317,10 @@ def set_item_visibility(view_layer, item, visible):
         elif isinstance(item, bpy.types.Collection):
             
             # Find the "original" LayerCollection in the build hierarchy
-            layer_coll = find_original_layer_collection(view_layer.layer_collection, item)
+            if layer_index is not None:
+                layer_coll = layer_index.get(item)
+            else:
+                layer_coll = find_original_layer_collection(view_layer.layer_collection, item)
 
             # --- REMOVED recursive fallback logic per user request ---
 
@@ -271,6 +346,9 @@ def set_item_visibility(view_layer, item, visible):
     except (ReferenceError, RuntimeError):
         # Item might have been deleted during the operation itself
         log.warning(f"Could not set visibility for '{item_name}'. It became invalid.")
+        return False
+
+    return True
 
 @persistent
 def on_frame_change_update_visibility(scene, depsgraph=None):
@@ -296,11 +374,12 @@ def on_frame_change_update_visibility(scene, depsgraph=None):
     current_frame = scene.frame_current
     view_layer = bpy.context.view_layer
 
+    # The switch frames are sorted once per cache rebuild; the latest switch at or
+    # before the current frame is then a bisect away instead of a filter + max per frame.
     active_shot_id = None
-    relevant_frames = [f for f in shot_switch_map.keys() if f <= current_frame]
-    if relevant_frames:
-        latest_switch_frame = max(relevant_frames)
-        active_shot_id = shot_switch_map[latest_switch_frame]
+    switch_index = bisect_right(shot_switch_frames, current_frame)
+    if switch_index:
+        active_shot_id = shot_switch_map[shot_switch_frames[switch_index - 1]]
 
     last_active_shot = getattr(bpy.context.window_manager, "active_shot_id", None)
     
@@ -309,11 +388,12 @@ def on_frame_change_update_visibility(scene, depsgraph=None):
         log.info(f"Frame {current_frame}: Shot changed to '{active_shot_id}'. Updating visibility.")
 
         # --- Logic Part 1: Manage visibility of the SHOT collections (existing logic) ---
-        all_shot_colls = get_all_shot_collections()
-        for coll in all_shot_colls:
-            coll_shot_id = get_shot_identifier(coll.name)
-            is_active = (coll_shot_id is not None and coll_shot_id == active_shot_id)
-            set_collection_exclude(view_layer, coll.name, not is_active)
+        # Rescanned on every shot change (rare) rather than cached, so renamed or
+        # replaced shot collections are always picked up.
+        set_collections_exclude(view_layer, {
+            coll_name: get_shot_collection_identifier(coll_name) != active_shot_id
+            for coll_name in (c.name for c in get_all_shot_collections())
+        })
 
         #--- Logic Part 2: Manage visibility of the ORIGINAL items ---
         items_to_hide_now = originals_to_hide_map.get(active_shot_id, set())
@@ -321,12 +401,17 @@ def on_frame_change_update_visibility(scene, depsgraph=None):
 
         # Unhide items that were hidden for the last shot but shouldn't be for this one.
         items_to_unhide = items_that_were_hidden - items_to_hide_now
+        if not items_to_unhide and not items_to_hide_now:
+            return
+
+        # One tree walk for all collection lookups instead of one per toggled collection.
+        layer_index = build_original_layer_collection_index(view_layer.layer_collection)
         for item in items_to_unhide:
-            set_item_visibility(view_layer, item, True)
+            set_item_visibility(view_layer, item, True, layer_index)
 
         # Hide items that are originals of copies present in the current active shot.
         for item in items_to_hide_now:
-            set_item_visibility(view_layer, item, False)
+            set_item_visibility(view_layer, item, False, layer_index)
 
 # --- General Helper Functions ---
 
@@ -336,42 +421,64 @@ def get_datablock_from_context(context):
     This function is designed to work for both menu drawing and operator execution by
     checking context attributes in a specific, robust order.
     """
+    # Each context attribute is resolved once: selected_ids in particular builds a new list
+    # of every selected ID on each access.
     # 1. Prioritize context.id, which is often set for the item under the cursor in UI contexts.
-    if hasattr(context, 'id') and context.id:
-        item = context.id
-        if isinstance(item, bpy.types.Collection):
-            log.debug(f"Context target identified via context.id: Collection '{item.name}'")
-            return item, 'COLLECTION'
-        if isinstance(item, bpy.types.Object):
-            log.debug(f"Context target identified via context.id: Object '{item.name}'")
-            return item, 'OBJECT'
+    # ID.id_type is already the 'COLLECTION'/'OBJECT' kind we return, so a string check
+    # replaces the isinstance() subclass walks.
+    item = getattr(context, 'id', None)
+    if item:
+        kind = getattr(item, 'id_type', None)
+        if kind in SUPPORTED_ID_TYPES:
+            log.debug("Context target identified via context.id: %s '%s'", kind, item.name)
+            return item, kind
 
     # 2. Check selected_ids, reliable for operator execution context after a click.
-    if hasattr(context, 'selected_ids') and context.selected_ids:
-        target_id = context.selected_ids[0]
-        if isinstance(target_id, bpy.types.Collection):
-            log.debug(f"Context target identified via selected_ids: Collection '{target_id.name}'")
-            return target_id, 'COLLECTION'
-        if isinstance(target_id, bpy.types.Object):
-            log.debug(f"Context target identified via selected_ids: Object '{target_id.name}'")
-            return target_id, 'OBJECT'
+    #    Only the Outliner and File Browser provide it, so other areas skip the lookup.
+    area = context.area
+    selected_ids = None
+    if area and area.type in SELECTED_IDS_AREA_TYPES:
+        selected_ids = getattr(context, 'selected_ids', None)
+    if selected_ids:
+        target_id = selected_ids[0]
+        kind = target_id.id_type
+        if kind in SUPPORTED_ID_TYPES:
+            log.debug("Context target identified via selected_ids: %s '%s'", kind, target_id.name)
+            return target_id, kind
 
     # 3. Fallback to active object.
     active_obj = context.active_object
     if active_obj:
-        log.debug(f"Context target identified via active_object: '{active_obj.name}'")
+        log.debug("Context target identified via active_object: '%s'", active_obj.name)
         return active_obj, 'OBJECT'
     
     # 4. Fallback to active collection in the Outliner.
-    if context.view_layer and context.view_layer.active_layer_collection:
-        active_coll = context.view_layer.active_layer_collection.collection
-        log.debug(f"Context target identified via active_layer_collection: '{active_coll.name}'")
+    view_layer = context.view_layer
+    active_layer_coll = view_layer.active_layer_collection if view_layer else None
+    if active_layer_coll:
+        active_coll = active_layer_coll.collection
+        log.debug("Context target identified via active_layer_collection: '%s'", active_coll.name)
         return active_coll, 'COLLECTION'
         
     # This log is commented out to prevent spamming the console when the cursor is over empty space.
     # log.warning("Could not determine a target datablock from the context.")
     return None, None
 
+def copy_object_to_collection(obj, target_coll, copy_data=True, obj_name=None):
+    """
+    Copies an object (and, if copy_data, its data) and links it into target_coll,
+    preserving the original name. Pass obj_name when calling in a loop so the name
+    isn't re-read from the original on every iteration. Returns the new object.
+    """
+    new_obj = obj.copy()
+    if copy_data:
+        obj_data = obj.data
+        if obj_data:
+            new_obj.data = obj_data.copy()
+    new_obj.name = obj_name if obj_name is not None else obj.name # Preserve name
+    target_coll.objects.link(new_obj)
+    return new_obj
+
 def copy_collection_hierarchy(original_coll, target_parent_coll, name_suffix=""):
     """
     Recursively performs a DEEP COPY (localization) or DUPLICATE (override)
@@ -383,6 +490,7 @@ def copy_collection_hierarchy(original_coll, target_parent_coll, name_suffix="")
     """
     # MODIFIED (Phase 2): Renamed object_map to item_map
     item_map = {}  # Maps original item -> new item (objects AND collections)
+    data_map = {}  # Maps original obj.data -> its copy, so instanced data is copied once
 
     # --- MODIFICATION START (VERSION 2.5.3) ---
     # This new helper function just *maps* an existing override hierarchy
@@ -458,13 +566,23 @@ def copy_collection_hierarchy(original_coll, target_parent_coll, name_suffix="")
             target_parent.children.link(new_coll)
             new_coll.color_tag = source_coll.color_tag
             
-            # 3. (Original Logic) Deep copy all objects from the source collection.
+            # 3. (Original Logic) Deep copy all objects from the source collection and link the
+            #    copies to our new collection. This is SAFE because new_coll is NOT an override.
+            #    One pass: this walk repeats for every target of a multi-shot move, so each
+            #    object gets a single item_map lookup instead of a copy pass plus a link pass.
+            new_coll_objects = new_coll.objects
             for obj in source_coll.objects:
-                if obj not in item_map: # MODIFIED: item_map
+                new_obj = item_map.get(obj) # MODIFIED: item_map
+                if new_obj is None:
                     new_obj = obj.copy()  # This correctly creates a new override if obj is one.
-                    if obj.data:
+                    obj_data = obj.data
+                    if obj_data:
                         # This also correctly creates a new override if data is one.
-                        new_obj.data = obj.data.copy()
+                        # Objects sharing data in the source keep sharing one copy.
+                        new_data = data_map.get(obj_data)
+                        if new_data is None:
+                            new_data = data_map[obj_data] = obj_data.copy()
+                        new_obj.data = new_data
 
                     # --- THIS IS THE FIX ---
                     # Preserve the original name for all objects.
@@ -472,15 +590,12 @@ def copy_collection_hierarchy(original_coll, target_parent_coll, name_suffix="")
                     # --- END FIX ---
                     
                     item_map[obj] = new_obj  # MODIFIED: item_map. Store the mapping
+                    new_coll_objects.link(new_obj)
+                elif new_obj.name not in new_coll_objects:
+                    # Already copied from another collection of this hierarchy.
+                    new_coll_objects.link(new_obj)
 
-            # 4. (Original Logic) Link the newly created deep-copied objects to our new collection.
-            #    This is SAFE because new_coll is NOT an override.
-            for obj in source_coll.objects:
-                new_obj = item_map.get(obj) # MODIFIED: item_map
-                if new_obj and new_obj.name not in new_coll.objects:
-                    new_coll.objects.link(new_obj)
-
-            # 5. Recurse for all child collections.
+            # 4. Recurse for all child collections.
             #    This ONLY happens for regular (non-override) collections.
             for child in source_coll.children:
                 # MODIFIED: pass item_map
@@ -537,8 +652,7 @@ def copy_collection_hierarchy(original_coll, target_parent_coll, name_suffix="")
 
 def get_project_scenes():
     """Retrieves all scenes matching the 'SC##-' naming convention."""
-    pattern = re.compile(r"^SC\d+-.*", re.IGNORECASE)
-    return sorted([s for s in bpy.data.scenes if pattern.match(s.name)], key=lambda s: s.name)
+    return sorted((s for s in bpy.data.scenes if PROJECT_SCENE_PATTERN.match(s.name)), key=attrgetter("name"))
 
 # --- NEW HELPER FUNCTIONS START ---
 
@@ -548,13 +662,11 @@ def is_in_build_hierarchy(layer_coll):
     i.e., NOT part of a 'shot' hierarchy (MODEL-SC##-SH###, etc.).
     """
     # --- MODIFICATION START ---
-    # --- MODIFIED --- Added 'PRP' to the pattern
-    shot_pattern = re.compile(r"^(MODEL|CAM|VFX|PRP)-SC\d+-SH\d+$", re.IGNORECASE)
     current = layer_coll
     
     # Check self and parents
     while current:
-        if current.collection and shot_pattern.match(current.collection.name):
+        if current.collection and SHOT_COLLECTION_PATTERN.match(current.collection.name):
             # It's inside a shot collection, so it's NOT an original "build" instance.
             return False
         
@@ -588,6 +700,23 @@ def find_original_layer_collection(layer_collection_root, collection_datablock):
             return found
     return None
 
+def build_original_layer_collection_index(layer_collection_root):
+    """
+    Walks the LayerCollection tree once and maps each Collection datablock to the
+    LayerCollection find_original_layer_collection() would return for it.
+    """
+    layer_index = {}
+
+    def _walk(layer_coll):
+        collection = layer_coll.collection
+        if collection not in layer_index and is_in_build_hierarchy(layer_coll):
+            layer_index[collection] = layer_coll
+        for child in layer_coll.children:
+            _walk(child)
+
+    _walk(layer_collection_root)
+    return layer_index
+
 # --- NEW HELPER FUNCTIONS END ---
 
 def find_layer_collection_by_name(layer_collection_root, name_to_find):
@@ -612,13 +741,40 @@ def set_collection_exclude(view_layer, collection_name, exclude_status):
     if layer_coll and layer_coll.exclude != exclude_status:
         layer_coll.exclude = exclude_status
 
-def get_source_collection(item):
-    """Finds the collection an object or collection belongs to."""
+def set_collections_exclude(view_layer, exclude_by_name):
+    """
+    Batch version of set_collection_exclude: { collection_name: exclude_status }.
+    Walks the LayerCollection tree once instead of once per collection.
+    """
+    pending = dict(exclude_by_name)
+
+    def _walk(layer_coll):
+        if not pending:
+            return
+        exclude_status = pending.pop(layer_coll.collection.name, None)
+        if exclude_status is not None and layer_coll.exclude != exclude_status:
+            layer_coll.exclude = exclude_status
+        for child in layer_coll.children:
+            _walk(child)
+
+    _walk(view_layer.layer_collection)
+
+def get_source_collection(item, parent_map=None):
+    """
+    Finds the collection an object or collection belongs to.
+    Pass a map from build_collection_parent_map() to resolve collection parents in O(1).
+    Operators build a fresh one per execute; the cached map is only for menu draws,
+    since back-to-back operator calls run without a depsgraph update to invalidate it.
+    """
     if isinstance(item, bpy.types.Object):
         if item.users_collection: return item.users_collection[0]
     elif isinstance(item, bpy.types.Collection):
-        for coll in bpy.data.collections:
-            if item.name in coll.children: return coll
+        if parent_map is not None:
+            parents = parent_map.get(item)
+            if parents: return parents[0]
+        else:
+            for coll in bpy.data.collections:
+                if item.name in coll.children: return coll
     return bpy.context.scene.collection
 
 def get_item_and_containing_collection(item):
@@ -631,18 +787,70 @@ def get_item_and_containing_collection(item):
                 return item, coll
     return item, bpy.context.scene.collection
 
-def is_in_shot_build_collection(item):
+def build_collection_parent_map():
     """
-    Recursively checks if an item is inside a collection whose name starts with '+SC', '+ART', etc.
-    Correctly handles items that belong to multiple collections (DAG).
+    Builds a child -> [parents] index of every collection in one pass over bpy.data.
+    Callers that need several parent lookups should build it once and pass it along.
     """
-    # 1. Build a parent map that supports multiple parents per child: child -> [parents]
     parent_map = {}
     for parent in bpy.data.collections:
         for child in parent.children:
-            if child not in parent_map:
-                parent_map[child] = []
-            parent_map[child].append(parent)
+            parent_map.setdefault(child, []).append(parent)
+    return parent_map
+
+# Shared lookups for the context menus; dropped on any depsgraph update, undo/redo or file load.
+menu_cache = {"parent_map": None, "has_shot_collections": None, "scene_shot_names": {}}
+
+def get_cached_collection_parent_map():
+    """Returns build_collection_parent_map(), reusing the last one until the data changes."""
+    if menu_cache["parent_map"] is None:
+        menu_cache["parent_map"] = build_collection_parent_map()
+    return menu_cache["parent_map"]
+
+def has_shot_collections():
+    """True if the file has any shot collection, reusing the answer until the data changes."""
+    if menu_cache["has_shot_collections"] is None:
+        menu_cache["has_shot_collections"] = any(
+            SHOT_COLLECTION_PATTERN.match(c.name) for c in bpy.data.collections
+        )
+    return menu_cache["has_shot_collections"]
+
+def get_scene_shot_collection_names(prefix, scene_prefix):
+    """
+    Sorted names of the '<prefix>-<scene_prefix>-SH###' shot collections, reusing the
+    last scan for that (prefix, scene) pair until the data changes.
+    """
+    key = (prefix, scene_prefix)
+    names = menu_cache["scene_shot_names"].get(key)
+    if names is None:
+        # Fold the scene filter into the shot regex so each collection name is matched
+        # once, without an upper-cased copy per collection.
+        scene_shot_pattern = get_scene_shot_pattern(prefix, scene_prefix)
+        # Only the names are drawn, so sort the name strings directly: no key function,
+        # no second RNA name read per entry when the menu items are created.
+        names = sorted(
+            name for name in (c.name for c in bpy.data.collections) if scene_shot_pattern.match(name)
+        )
+        menu_cache["scene_shot_names"][key] = names
+    return names
+
+@persistent
+def invalidate_menu_cache(*args):
+    """Handler that discards the cached menu lookups after collections may have changed."""
+    menu_cache["parent_map"] = None
+    menu_cache["has_shot_collections"] = None
+    menu_cache["scene_shot_names"].clear()
+
+MENU_CACHE_INVALIDATION_HANDLERS = ("depsgraph_update_post", "undo_post", "redo_post", "load_post")
+
+def is_in_shot_build_collection(item, parent_map=None):
+    """
+    Recursively checks if an item is inside a collection whose name starts with '+SC', '+ART', etc.
+    Correctly handles items that belong to multiple collections (DAG).
+    """
+    # 1. Use (or build) a parent map that supports multiple parents per child: child -> [parents]
+    if parent_map is None:
+        parent_map = build_collection_parent_map()
 
     # 2. Get the item and its immediate parent(s)
     if isinstance(item, bpy.types.Object):
@@ -656,8 +864,6 @@ def is_in_shot_build_collection(item):
     # 3. Traverse up ALL hierarchies using a set to avoid cycles/re-visiting
     visited = set()
     stack = list(current_colls)
-    
-    valid_prefixes = ("+SC", "+ART", "+ANI", "+VFX")
 
     while stack:
         current = stack.pop()
@@ -666,7 +872,7 @@ def is_in_shot_build_collection(item):
             continue
         visited.add(current)
         
-        if current.name.startswith(valid_prefixes):
+        if current.name.startswith(SHOT_BUILD_PREFIXES):
             return True
         
         # Add all parents of this collection to the stack
@@ -685,6 +891,12 @@ class ADVCOPY_OT_copy_to_shot(bpy.types.Operator):
 
     target_shot_collection: StringProperty()
 
+    @classmethod
+    def poll(cls, context):
+        # Read live from the context, never from the handler-invalidated menu cache,
+        # which scripts and back-to-back operator calls can see stale.
+        return get_datablock_from_context(context)[0] is not None
+
     def execute(self, context):
         datablock, datablock_type = get_datablock_from_context(context)
         if not datablock:
@@ -704,14 +916,7 @@ class ADVCOPY_OT_copy_to_shot(bpy.types.Operator):
 
         new_datablock = None
         if datablock_type == 'OBJECT':
-            new_datablock = datablock.copy()
-            if datablock.data: new_datablock.data = datablock.data.copy()
-            
-            # --- THIS IS THE FIX ---
-            new_datablock.name = datablock.name # Preserve name
-            # --- END FIX ---
-            
-            target_coll.objects.link(new_datablock)
+            new_datablock = copy_object_to_collection(datablock, target_coll)
             
             # --- MODIFIED (Phase 3): Save 1-to-1 mapping ---
             if new_datablock:
@@ -756,6 +961,10 @@ class ADVCOPY_OT_move_to_all_shots(bpy.types.Operator):
     bl_label = "Move to All Shots"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @classmethod
+    def poll(cls, context):
+        return get_datablock_from_context(context)[0] is not None
+
     def execute(self, context):
         datablock, datablock_type = get_datablock_from_context(context)
         if not datablock:
@@ -763,22 +972,15 @@ class ADVCOPY_OT_move_to_all_shots(bpy.types.Operator):
             return {'CANCELLED'}
         
         datablock_name = datablock.name
-        source_collection = get_source_collection(datablock)
+        source_collection = get_source_collection(datablock, build_collection_parent_map())
         if not source_collection:
             self.report({'ERROR'}, "Could not determine the source collection.")
             return {'CANCELLED'}
         
-        # --- MODIFIED --- Added 'PRP' logic
-        if "MODEL" in source_collection.name:
-            prefix = "MODEL"
-        elif "PRP" in source_collection.name:
-            prefix = "PRP"
-        else:
-            prefix = "VFX" # Keep original fallback
-        # --- END MODIFIED ---
+        prefix = get_shot_prefix(source_collection.name)
             
-        shot_pattern = re.compile(rf"^{prefix}-SC\d+-SH\d+$", re.IGNORECASE)
-        shot_collections = sorted([c for c in bpy.data.collections if shot_pattern.match(c.name)], key=lambda c: c.name)
+        shot_pattern = PREFIXED_SHOT_COLLECTION_PATTERNS[prefix]
+        shot_collections = sorted((c for c in bpy.data.collections if shot_pattern.match(c.name)), key=attrgetter("name"))
 
         if not shot_collections:
             self.report({'WARNING'}, f"No '{prefix}' shot collections found.")
@@ -799,18 +1001,11 @@ class ADVCOPY_OT_move_to_all_shots(bpy.types.Operator):
 
             new_datablock = None
             if datablock_type == 'OBJECT':
-                new_datablock = datablock.copy()
-                if datablock.data: new_datablock.data = datablock.data.copy()
-                
-                # --- THIS IS THE FIX ---
-                new_datablock.name = datablock_name # Preserve original name
-                # --- END FIX ---
-                
-                target_coll.objects.link(new_datablock)
+                new_datablock = copy_object_to_collection(datablock, target_coll, obj_name=datablock_name)
                 
                 # --- MODIFIED (Phase 3): Add to map ---
                 if new_datablock:
-                    map_data[new_datablock.name] = datablock.name
+                    map_data[new_datablock.name] = datablock_name
                 # --- End Modification ---
 
             elif datablock_type == 'COLLECTION':
@@ -856,35 +1051,33 @@ class ADVCOPY_OT_move_to_all_scenes(bpy.types.Operator):
     bl_label = "Move to All Matching Scenes"
     bl_options = {'REGISTER', 'UNDO'}
 
+    unique_data: BoolProperty(
+        name="Unique Data",
+        description="Give each scene's copy its own object data instead of sharing the original's mesh/curve/etc.",
+        default=False
+    )
+
     def execute(self, context):
         datablock, datablock_type = get_datablock_from_context(context)
         if not datablock:
             self.report({'ERROR'}, "Operation requires an active or selected Object/Collection.")
             return {'CANCELLED'}
 
-        source_collection = get_source_collection(datablock)
+        source_collection = get_source_collection(datablock, build_collection_parent_map())
         # --- MODIFIED --- Added 'PRP-ENV' check
-        if not source_collection or not (
-            source_collection.name.startswith("MODEL-ENV") or 
-            source_collection.name.startswith("VFX-ENV") or 
-            source_collection.name.startswith("PRP-ENV")
-        ):
+        source_name = source_collection.name if source_collection else ""
+        if not source_name.startswith(ENV_SOURCE_PREFIXES):
             self.report({'ERROR'}, "Selected item must be in a 'MODEL-ENV...', 'VFX-ENV...', or 'PRP-ENV...' collection.")
             return {'CANCELLED'}
         
-        enviro_name_match = re.search(r"ENV-(.+)", source_collection.name, re.IGNORECASE)
-        if not enviro_name_match:
-            self.report({'ERROR'}, f"Could not extract environment name from '{source_collection.name}'.")
+        # The prefix check above guarantees an upper-case 'ENV-' separator.
+        enviro_name = source_name.partition("ENV-")[2]
+        if not enviro_name:
+            self.report({'ERROR'}, f"Could not extract environment name from '{source_name}'.")
             return {'CANCELLED'}
-        enviro_name = enviro_name_match.group(1)
         
         # --- MODIFIED --- Added 'PRP' logic
-        if source_collection.name.startswith("MODEL"):
-            prefix = "MODEL"
-        elif source_collection.name.startswith("PRP"):
-            prefix = "PRP"
-        else:
-            prefix = "VFX" # Keep original fallback
+        prefix = get_source_prefix(source_name)
         # --- END MODIFIED ---
             
         all_scenes = get_project_scenes()
@@ -894,16 +1087,24 @@ class ADVCOPY_OT_move_to_all_scenes(bpy.types.Operator):
             self.report({'WARNING'}, f"No scenes found with '{enviro_name}' in their name.")
             return {'CANCELLED'}
         
+        # --- MODIFIED --- Handle 'PRP' -> 'ART' mapping same as 'MODEL'
+        # Loop-invariant, so resolved once rather than per scene.
+        parent_prefix = "ART" if (prefix == "MODEL" or prefix == "PRP") else "VFX"
+        # Scene-independent heads of the '+ART-<scene>+' / 'MODEL-<scene>' target names.
+        parent_coll_head = f"+{parent_prefix}-"
+        target_coll_head = f"{prefix}-"
+        datablock_name = datablock.name
+        unique_data = self.unique_data
+
         copied_count = 0
         for scene in matching_scenes:
             final_target_coll = None
-            base_scene_coll = scene.collection.children.get(f"+{scene.name}+")
+            scene_name = scene.name
+            base_scene_coll = scene.collection.children.get("+" + scene_name + "+")
             if base_scene_coll:
-                # --- MODIFIED --- Handle 'PRP' -> 'ART' mapping same as 'MODEL'
-                parent_prefix = "ART" if (prefix == "MODEL" or prefix == "PRP") else "VFX"
-                parent_coll = base_scene_coll.children.get(f"+{parent_prefix}-{scene.name}+")
+                parent_coll = base_scene_coll.children.get(parent_coll_head + scene_name + "+")
                 if parent_coll:
-                    final_target_coll = parent_coll.children.get(f"{prefix}-{scene.name}")
+                    final_target_coll = parent_coll.children.get(target_coll_head + scene_name)
 
             if final_target_coll:
                 # --- MODIFICATION START ---
@@ -911,22 +1112,14 @@ class ADVCOPY_OT_move_to_all_scenes(bpy.types.Operator):
                 # --- MODIFICATION END ---
                 
                 if datablock_type == 'OBJECT':
-                    new_obj = datablock.copy()
-                    if datablock.data:
-                        new_obj.data = datablock.data.copy()
-                        
-                    # --- THIS IS THE FIX ---
-                    new_obj.name = datablock.name # Preserve name
-                    # --- END FIX ---
-                    
-                    final_target_coll.objects.link(new_obj)
+                    copy_object_to_collection(datablock, final_target_coll, unique_data, datablock_name)
                 elif datablock_type == 'COLLECTION':
                     # copy_collection_hierarchy now handles overrides correctly
                     # This returns a map, but we DON'T save it, per user request.
                     copy_collection_hierarchy(datablock, final_target_coll, "")
                 copied_count += 1
             else:
-                log.warning(f"Could not find target collection for '{prefix}' in scene '{scene.name}'.")
+                log.warning(f"Could not find target collection for '{prefix}' in scene '{scene_name}'.")
 
         if copied_count > 0:
             if datablock_type == 'OBJECT':
@@ -947,69 +1140,79 @@ class ADVCOPY_OT_move_to_all_scenes(bpy.types.Operator):
         return {'FINISHED'}
 
 class ADVCOPY_OT_copy_to_all_enviros(bpy.types.Operator):
-    """Copies an item from a LOC collection into each ENV collection, creating a unique item for each, and removes the original."""
+    """Copies an item from a LOC collection into each ENV collection and removes the original. The copies share the original's object data unless Unique Data is enabled."""
     bl_idname = "advanced_copy.copy_to_all_enviros"
     bl_label = "-> to each ENV"
     bl_options = {'REGISTER', 'UNDO'}
 
+    unique_data: BoolProperty(
+        name="Unique Data",
+        description="Give each ENV's copy its own object data. Off by default: all copies share the original's mesh/curve/etc.",
+        default=False
+    )
+
     def execute(self, context):
         datablock, datablock_type = get_datablock_from_context(context)
         if not datablock:
             self.report({'ERROR'}, "Operation requires an active or selected Object/Collection.")
             return {'CANCELLED'}
 
-        source_collection = get_source_collection(datablock)
+        source_collection = get_source_collection(datablock, build_collection_parent_map())
         # --- MODIFIED --- Added 'PRP-LOC' check
-        if not source_collection or not (
-            source_collection.name.startswith("MODEL-LOC") or 
-            source_collection.name.startswith("VFX-LOC") or
-            source_collection.name.startswith("PRP-LOC")
-        ):
+        source_name = source_collection.name if source_collection else ""
+        if not source_name.startswith(LOC_SOURCE_PREFIXES):
             self.report({'ERROR'}, "Selected item must be in a 'MODEL-LOC...', 'VFX-LOC...', or 'PRP-LOC...' collection.")
             return {'CANCELLED'}
         
         # --- MODIFIED --- Added 'PRP' logic
-        if source_collection.name.startswith("MODEL"):
-            prefix = "MODEL"
-        elif source_collection.name.startswith("PRP"):
-            prefix = "PRP"
-        else:
-            prefix = "VFX" # Keep original fallback
+        prefix = get_source_prefix(source_name)
         # --- END MODIFIED ---
             
-        all_env_parent_collections = [c for c in bpy.data.collections if c.name.startswith("+ENV-")]
+        # '+ENV-...+' roots are created directly under a scene's master collection (and linked
+        # into shot scenes the same way), so only the scenes' top-level children need checking
+        # rather than every collection in the file. Each root is paired with its name so the
+        # RNA name is only read once, and roots linked into several scenes are kept once.
+        all_env_parent_collections = []
+        seen_env_parents = set()
+        for scene in bpy.data.scenes:
+            for c in scene.collection.children:
+                name = c.name
+                if name.startswith("+ENV-") and name not in seen_env_parents:
+                    seen_env_parents.add(name)
+                    all_env_parent_collections.append((c, name))
         if not all_env_parent_collections:
             self.report({'WARNING'}, "No parent '+ENV-...' collections found to copy to.")
             return {'CANCELLED'}
 
-        copied_count = 0
-        for env_parent_coll in all_env_parent_collections:
-            base_name = env_parent_coll.name.strip('+')
+        datablock_name = datablock.name
+        unique_data = self.unique_data
+
+        # Resolve every target first, then do all copies/links in one batch, so the
+        # read-only name lookups aren't interleaved with the data mutations.
+        target_sub_colls = []
+        for env_parent_coll, env_parent_name in all_env_parent_collections:
+            # '+ENV-Name+' -> 'ENV-Name' by slicing off the wrapping '+' signs.
+            base_name = env_parent_name[1:-1] if env_parent_name.endswith("+") else env_parent_name[1:]
             target_sub_coll_name = f"{prefix}-{base_name}"
             target_sub_coll = env_parent_coll.children.get(target_sub_coll_name)
             
             if target_sub_coll:
-                # --- MODIFICATION START ---
-                # name_suffix and env_name_suffix_match logic is REMOVED
-                # --- MODIFICATION END ---
-
-                if datablock_type == 'OBJECT':
-                    new_obj = datablock.copy()
-                    if datablock.data:
-                        new_obj.data = datablock.data.copy()
-                        
-                    # --- THIS IS THE FIX ---
-                    new_obj.name = datablock.name # Preserve name
-                    # --- END FIX ---
-                    
-                    target_sub_coll.objects.link(new_obj)
-                elif datablock_type == 'COLLECTION':
-                    # copy_collection_hierarchy now handles overrides correctly
-                    # This returns a map, but we DON'T save it, per user request.
-                    copy_collection_hierarchy(datablock, target_sub_coll, "")
-                copied_count += 1
+                target_sub_colls.append(target_sub_coll)
             else:
-                log.warning(f"Could not find sub-collection '{target_sub_coll_name}' in '{env_parent_coll.name}'")
+                log.warning(f"Could not find sub-collection '{target_sub_coll_name}' in '{env_parent_name}'")
+
+        # --- MODIFICATION START ---
+        # name_suffix and env_name_suffix_match logic is REMOVED
+        # --- MODIFICATION END ---
+        copied_count = 0
+        for target_sub_coll in target_sub_colls:
+            if datablock_type == 'OBJECT':
+                copy_object_to_collection(datablock, target_sub_coll, unique_data, datablock_name)
+            elif datablock_type == 'COLLECTION':
+                # copy_collection_hierarchy now handles overrides correctly
+                # This returns a map, but we DON'T save it, per user request.
+                copy_collection_hierarchy(datablock, target_sub_coll, "")
+            copied_count += 1
 
         if copied_count > 0:
             # --- FIX 2: Rebuild cache after modifying build hierarchy ---
@@ -1034,6 +1237,10 @@ class ADVCOPY_OT_clear_original_visibility(bpy.types.Operator):
     bl_label = "Make All Originals Visible"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @classmethod
+    def poll(cls, context):
+        return bool(originals_to_hide_map)
+
     def execute(self, context):
         log.info("Clearing visibility for all original items.")
         view_layer = context.view_layer
@@ -1048,15 +1255,11 @@ class ADVCOPY_OT_clear_original_visibility(bpy.types.Operator):
             return {'CANCELLED'}
 
         count = 0
+        layer_index = build_original_layer_collection_index(view_layer.layer_collection)
         for item in all_originals:
-            try:
-                # Check if item still exists before trying to modify it
-                if item and (item.name in bpy.data.objects or item.name in bpy.data.collections):
-                    set_item_visibility(view_layer, item, True)
-                    count += 1
-            except ReferenceError:
-                log.warning(f"Could not unhide item as it no longer exists. A cache rebuild is recommended.")
-                pass
+            # set_item_visibility does its own existence checks and reports success.
+            if set_item_visibility(view_layer, item, True, layer_index):
+                count += 1
 
         self.report({'INFO'}, f"Made {count} original item(s) visible.")
         
@@ -1096,11 +1299,17 @@ class ADVCOPY_OT_make_all_visible(bpy.types.Operator):
         view_layer = context.view_layer
         
         # Helper to recursively unhide layer collections
+        # Only write flags that are actually set: every RNA write tags the depsgraph, even a no-op one.
         def _unhide_layer_collections(layer_coll):
-            layer_coll.exclude = False
-            layer_coll.hide_viewport = False
-            layer_coll.collection.hide_viewport = False
-            layer_coll.collection.hide_render = False
+            if layer_coll.exclude:
+                layer_coll.exclude = False
+            if layer_coll.hide_viewport:
+                layer_coll.hide_viewport = False
+            collection = layer_coll.collection
+            if collection.hide_viewport:
+                collection.hide_viewport = False
+            if collection.hide_render:
+                collection.hide_render = False
             
             for child in layer_coll.children:
                 _unhide_layer_collections(child)
@@ -1111,10 +1320,14 @@ class ADVCOPY_OT_make_all_visible(bpy.types.Operator):
         count = 0
         for obj in bpy.data.objects:
             try:
-                obj.hide_set(False)
-                obj.hide_viewport = False
-                obj.hide_render = False
-                obj.hide_select = False
+                if obj.hide_get():
+                    obj.hide_set(False)
+                if obj.hide_viewport:
+                    obj.hide_viewport = False
+                if obj.hide_render:
+                    obj.hide_render = False
+                if obj.hide_select:
+                    obj.hide_select = False
                 count += 1
             except:
                 pass
@@ -1135,11 +1348,11 @@ class ADVCOPY_MT_copy_to_shot_menu(bpy.types.Menu):
         datablock, _ = get_datablock_from_context(context)
         if not datablock: return
 
-        source_collection = get_source_collection(datablock)
+        source_collection = get_source_collection(datablock, get_cached_collection_parent_map())
         if not source_collection: return
 
         current_scene = context.scene
-        scene_match = re.match(r"^(SC\d+)", current_scene.name, re.IGNORECASE)
+        scene_match = SCENE_NUMBER_PATTERN.match(current_scene.name)
 
         if not scene_match:
             layout.label(text="Scene must be named like 'SC##-...'")
@@ -1147,32 +1360,16 @@ class ADVCOPY_MT_copy_to_shot_menu(bpy.types.Menu):
         
         current_scene_prefix = scene_match.group(1).upper()
         
-        # --- MODIFIED --- Added 'PRP' logic
-        if "MODEL" in source_collection.name:
-            prefix = "MODEL"
-        elif "PRP" in source_collection.name:
-            prefix = "PRP"
-        else:
-            prefix = "VFX" # Keep original fallback
-        # --- END MODIFIED ---
-            
-        shot_pattern = re.compile(rf"^{prefix}-SC\d+-SH\d+$", re.IGNORECASE)
-        
-        shot_collections = sorted(
-            [
-                c for c in bpy.data.collections 
-                if shot_pattern.match(c.name) and c.name.upper().startswith(f"{prefix}-{current_scene_prefix}")
-            ], 
-            key=lambda c: c.name
-        )
+        prefix = get_shot_prefix(source_collection.name)
+        shot_collection_names = get_scene_shot_collection_names(prefix, current_scene_prefix)
 
-        if not shot_collections:
+        if not shot_collection_names:
             layout.label(text=f"No '{prefix}' shots found for {current_scene_prefix}")
             return
 
-        for coll in shot_collections:
-            op = layout.operator(ADVCOPY_OT_copy_to_shot.bl_idname, text=coll.name)
-            op.target_shot_collection = coll.name
+        for coll_name in shot_collection_names:
+            op = layout.operator(ADVCOPY_OT_copy_to_shot.bl_idname, text=coll_name)
+            op.target_shot_collection = coll_name
 
 
 # --- UI Integration ---
@@ -1181,20 +1378,47 @@ def add_context_menus(self, context):
     """Generic function to draw the menu items based on the current context."""
     datablock, _ = get_datablock_from_context(context)
     if not datablock: return
-    
-    layout = self.layout
+    draw_context_menu_items(self.layout, datablock)
+
+def add_view3d_context_menu(self, context):
+    """
+    3D Viewport specialization of add_context_menus. The viewport has no context.id or
+    selected_ids, so the active object is checked first and the generic lookup is only
+    used for its active-collection fallback.
+    """
+    datablock = context.active_object
+    if not datablock:
+        datablock, _ = get_datablock_from_context(context)
+        if not datablock: return
+    draw_context_menu_items(self.layout, datablock)
+
+def draw_context_menu_items(layout, datablock):
+    """Draws the Advanced Copy entries that apply to the given datablock."""
     layout.separator()
 
-    if is_in_shot_build_collection(datablock):
-        layout.menu(ADVCOPY_MT_copy_to_shot_menu.bl_idname, icon='COPYDOWN')
+    parent_map = get_cached_collection_parent_map()
+    in_shot_build = is_in_shot_build_collection(datablock, parent_map)
+    if in_shot_build and not has_shot_collections():
+        # Nothing to copy or move to: show why instead of two entries that would do nothing.
+        disabled_col = layout.column()
+        disabled_col.enabled = False
+        disabled_col.label(text="No shot collections in this file", icon='COPYDOWN')
+    elif in_shot_build:
+        # Hand the resolved datablock to the submenu as context.id, so its draw (and the
+        # operators it spawns) pick it up at step 1 of get_datablock_from_context.
+        # Scoped to a sub-layout so items appended after ours keep the original context.
+        shot_menu_col = layout.column()
+        shot_menu_col.context_pointer_set("id", datablock)
+        shot_menu_col.menu(ADVCOPY_MT_copy_to_shot_menu.bl_idname, icon='COPYDOWN')
         layout.operator(ADVCOPY_OT_move_to_all_shots.bl_idname, icon='GHOST_ENABLED')
 
-    source_collection = get_source_collection(datablock)
+    source_collection = get_source_collection(datablock, parent_map)
     if source_collection:
         # --- MODIFIED --- Added 'PRP' checks
-        if source_collection.name.startswith(("MODEL-ENV", "VFX-ENV", "PRP-ENV")):
+        source_name = source_collection.name
+        if source_name.startswith(ENV_SOURCE_PREFIXES):
             layout.operator(ADVCOPY_OT_move_to_all_scenes.bl_idname, icon='SCENE_DATA')
-        if source_collection.name.startswith(("MODEL-LOC", "VFX-LOC", "PRP-LOC")):
+        elif source_name.startswith(LOC_SOURCE_PREFIXES):
             layout.operator(ADVCOPY_OT_copy_to_all_enviros.bl_idname, icon='CON_TRANSLIKE')
     layout.separator()
 
@@ -1234,20 +1458,16 @@ def update_auto_shot_exclusion(self, context):
         view_layer = context.view_layer
         
         # Make all shot collections visible
-        for coll in get_all_shot_collections():
-            set_collection_exclude(view_layer, coll.name, False)
+        set_collections_exclude(view_layer, {coll.name: False for coll in get_all_shot_collections()})
         
         # Unhide all possible original items that the system might have hidden
         all_originals = set()
         for original_set in originals_to_hide_map.values():
             all_originals.update(original_set)
         
+        layer_index = build_original_layer_collection_index(view_layer.layer_collection)
         for item in all_originals:
-            try:
-                if item and (item.name in bpy.data.objects or item.name in bpy.data.collections):
-                    set_item_visibility(view_layer, item, True)
-            except ReferenceError:
-                pass # Item no longer exists
+            set_item_visibility(view_layer, item, True, layer_index)
 
         log.info("Manual visibility control restored.")
     else:
@@ -1302,6 +1522,10 @@ def register():
         bpy.app.handlers.frame_change_pre.append(on_frame_change_update_visibility)
     if build_visibility_data_on_load not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(build_visibility_data_on_load)
+    for handler_name in MENU_CACHE_INVALIDATION_HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_name)
+        if invalidate_menu_cache not in handlers:
+            handlers.append(invalidate_menu_cache)
         
     # Register a timer to build the cache shortly after startup
     # This avoids the context error that happens if we call it directly during register
@@ -1309,13 +1533,18 @@ def register():
 
     bpy.types.OUTLINER_MT_collection.append(add_context_menus)
     bpy.types.OUTLINER_MT_object.append(add_context_menus)
-    bpy.types.VIEW3D_MT_object_context_menu.append(add_context_menus)
+    bpy.types.VIEW3D_MT_object_context_menu.append(add_view3d_context_menu)
 
 def unregister():
     if on_frame_change_update_visibility in bpy.app.handlers.frame_change_pre:
         bpy.app.handlers.frame_change_pre.remove(on_frame_change_update_visibility)
     if build_visibility_data_on_load in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(build_visibility_data_on_load)
+    for handler_name in MENU_CACHE_INVALIDATION_HANDLERS:
+        handlers = getattr(bpy.app.handlers, handler_name)
+        if invalidate_menu_cache in handlers:
+            handlers.remove(invalidate_menu_cache)
+    invalidate_menu_cache()
 
     try:
         del bpy.types.WindowManager.active_shot_id
@@ -1325,7 +1554,7 @@ def unregister():
 
     bpy.types.OUTLINER_MT_collection.remove(add_context_menus)
     bpy.types.OUTLINER_MT_object.remove(add_context_menus)
-    bpy.types.VIEW3D_MT_object_context_menu.remove(add_context_menus)
+    bpy.types.VIEW3D_MT_object_context_menu.remove(add_view3d_context_menu)
     
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
@@ -51,8 +51,9 @@ def get_current_user():
 
     if not user_name:
         text_block_name = "krutart-configurations.info"
-        if text_block_name in bpy.data.texts:
-            content = bpy.data.texts[text_block_name].as_string()
+        text_block = bpy.data.texts.get(text_block_name)
+        if text_block:
+            content = text_block.as_string()
             match = re.search(r"last saved by:\s*(.*?)\s+-", content, re.IGNORECASE)
             if match:
                 user_name = match.group(1).strip()
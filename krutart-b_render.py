@@ -15,12 +15,12 @@ import re
 import os
 import logging
 import sys
-import subprocess
-import tempfile
 import json
-import urllib.request
 import threading
 import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from operator import attrgetter
 from bpy.app.handlers import persistent
 
 # --- DEBUG HANDLER FOR WORKERS ---
@@ -68,6 +68,18 @@ def attach_project_logger(target_directory):
 # --- GLOBAL VARS FOR HANDLERS ---
 _last_scene_name = ""
 
+# --- SHOT MARKER PATTERNS ---
+# Compiled once at import; these are matched against every timeline marker
+# whenever the shot list, timing or naming helpers run.
+SHOT_MARKER_PATTERN = re.compile(r"CAM-(SC\d+)-(SH\d+)", re.IGNORECASE)
+SHOT_MARKER_ID_PATTERN = re.compile(r"CAM-(SC\d+-SH\d+)", re.IGNORECASE)
+
+
+# Lightweight shot range records: built per lookup, so a tuple subclass
+# (unpackable like the bare tuples callers used before) instead of a dict.
+ShotTiming = namedtuple("ShotTiming", "start_frame end_frame duration")
+ShotInfo = namedtuple("ShotInfo", "shot_marker end_frame duration")
+
 # --- PREFERENCES HELPER ---
 def get_prefs(context):
     """
@@ -305,22 +317,21 @@ def _find_film_scene_name_on_disk(base_path, scene_number_str):
     Scans the OUTPUT_BASE directory for a folder matching SC{number}-NAME.
     Returns the 'NAME' part (Film Scene Name) if found, otherwise None.
     """
-    if not os.path.exists(base_path):
-        return None
-
-    search_prefix = scene_number_str.upper()
+    search_prefix = f"{scene_number_str.upper()}-"
 
     try:
-        for d in os.listdir(base_path):
-            if not os.path.isdir(os.path.join(base_path, d)):
-                continue
+        # scandir reuses the file type from the directory listing, so no extra stat per entry
+        with os.scandir(base_path) as entries:
+            for entry in entries:
+                if not entry.name.upper().startswith(search_prefix) or not entry.is_dir():
+                    continue
 
-            d_upper = d.upper()
-            if d_upper.startswith(f"{search_prefix}-"):
-                parts = d.split("-", 1)
+                parts = entry.name.split("-", 1)
                 if len(parts) > 1:
                     return parts[1]
 
+    except FileNotFoundError:
+        return None
     except Exception as e:
         log.error(f"Error scanning directory for film scene name: {e}")
 
@@ -330,7 +341,7 @@ def _parse_name_components(context, shot_marker_name, source_scene_name):
     """Parses all required name components."""
     log.info("Parsing name components...")
 
-    shot_match = re.match(r"CAM-(SC\d+)-(SH\d+)", shot_marker_name, re.IGNORECASE)
+    shot_match = SHOT_MARKER_PATTERN.match(shot_marker_name)
     if not shot_match:
         log.error(f"Could not parse shot marker name: {shot_marker_name}")
         return None
@@ -375,26 +386,28 @@ def _parse_name_components(context, shot_marker_name, source_scene_name):
 
 def _get_shot_timing(context, shot_marker):
     """Utility to get shot start, end, and duration."""
-    shot_markers = sorted(
-        [m for m in context.scene.timeline_markers if re.match(r"CAM-SC\d+-SH\d+", m.name, re.IGNORECASE)],
-        key=lambda m: m.frame
-    )
+    shot_markers, shot_frames = _get_sorted_shot_markers(context.scene)
 
     shot_start_frame = shot_marker.frame
     shot_end_frame = context.scene.frame_end + 1 
 
-    try:
-        current_marker_index = shot_markers.index(shot_marker)
+    # The list is sorted by frame, so only markers sharing this start frame need an identity check.
+    current_marker_index = bisect_left(shot_frames, shot_start_frame)
+    while current_marker_index < len(shot_frames) and shot_frames[current_marker_index] == shot_start_frame:
+        if shot_markers[current_marker_index] == shot_marker:
+            break
+        current_marker_index += 1
+    else:
+        current_marker_index = None
+
+    if current_marker_index is not None:
         if current_marker_index < len(shot_markers) - 1:
-            next_marker = shot_markers[current_marker_index + 1]
-            shot_end_frame = next_marker.frame
-    except ValueError:
+            shot_end_frame = shot_frames[current_marker_index + 1]
+    else:
         log.warning(f"Could not find shot marker '{shot_marker.name}' in the sorted list.")
-        all_markers = sorted([m for m in context.scene.timeline_markers], key=lambda m: m.frame)
-        for m in all_markers:
-            if m.frame > shot_start_frame:
-                shot_end_frame = m.frame
-                break
+        later_frames = [m.frame for m in context.scene.timeline_markers if m.frame > shot_start_frame]
+        if later_frames:
+            shot_end_frame = min(later_frames)
 
     shot_duration = shot_end_frame - shot_start_frame
     if shot_duration <= 0:
@@ -402,7 +415,7 @@ def _get_shot_timing(context, shot_marker):
         return None, None, None
 
     log.info(f"Shot timing found: Start={shot_start_frame}, End={shot_end_frame-1}, Duration={shot_duration} frames.")
-    return shot_start_frame, shot_end_frame, shot_duration
+    return ShotTiming(shot_start_frame, shot_end_frame, shot_duration)
 
 def _get_scene_content_duration(source_scene):
     """Finds the intended duration of the scene's content."""
@@ -518,8 +531,9 @@ def _prepare_shot_in_current_file(context, shot_marker):
 
     original_active_scene = get_active_scene_safe(context)
     original_frame = original_active_scene.frame_current
+    # frame_set() already evaluates the depsgraph (including any re-tagging by
+    # frame_change_post handlers), so no extra view_layer.update() is needed here.
     original_active_scene.frame_set(shot_marker.frame)
-    context.view_layer.update()
 
     output_format = context.scene.brender_output_format
 
@@ -632,13 +646,13 @@ def _prepare_shot_in_current_file(context, shot_marker):
         shot_name_prefix = shot_marker.name
 
         scene_num_str, shot_num_str = "", ""
-        name_match = re.match(r"CAM-(SC\d+)-(SH\d+)", shot_marker.name, re.IGNORECASE)
+        name_match = SHOT_MARKER_PATTERN.match(shot_marker.name)
         if name_match:
             scene_num_str = name_match.group(1).lower()
             shot_num_str = name_match.group(2).lower()
 
         all_strips = getattr(vse_source, 'sequences_all', vse_source.sequences)
-        candidates = sorted([s for s in all_strips if not s.mute], key=lambda s: s.channel, reverse=True)
+        candidates = sorted((s for s in all_strips if not s.mute), key=attrgetter("channel"), reverse=True)
 
         for strip in candidates:
             if strip.name.startswith(shot_name_prefix):
@@ -908,13 +922,13 @@ def _get_new_brender_filepath_parts(context, name_components):
                 return None, None, None
 
             brender_dir = os.path.join(master_sh_dir, f"{sc_upper}-{sh_upper}-RENDER")
-            os.makedirs(brender_dir, exist_ok=True)
             
             composite_version = _get_composite_production_version(context)
             version_str_out = composite_version
             
             version_dir_name = f"{sc_upper}-{sh_upper}-{composite_version}_R"
             version_dir_path = os.path.join(brender_dir, version_dir_name)
+            # Creates brender_dir as well
             os.makedirs(version_dir_path, exist_ok=True)
             
             task_lower = task.lower()
@@ -943,15 +957,19 @@ def _get_new_brender_filepath_parts(context, name_components):
             prefix_lower = filename_prefix.lower()
             
             version = 1
-            if os.path.exists(brender_dir):
-                existing_files = [f for f in os.listdir(brender_dir) if f.lower().startswith(prefix_lower) and f.lower().endswith('.blend')]
-                if existing_files:
-                    max_version = 0
-                    for f in existing_files:
-                        version_match = re.search(r"-v(\d+)\.blend$", f, re.IGNORECASE)
-                        if version_match:
-                            max_version = max(max_version, int(version_match.group(1)))
-                    version = max_version + 1
+            # brender_dir was just created above, no need to probe it again before listing
+            existing_stems = []
+            for f in os.listdir(brender_dir):
+                stem, ext = os.path.splitext(f)
+                if ext.lower() == '.blend' and stem.lower().startswith(prefix_lower):
+                    existing_stems.append(stem)
+            if existing_stems:
+                max_version = 0
+                for stem in existing_stems:
+                    version_match = re.search(r"-v(\d+)$", stem, re.IGNORECASE)
+                    if version_match:
+                        max_version = max(max_version, int(version_match.group(1)))
+                version = max_version + 1
                     
             version_str_out = f"v{version:03d}"
             filename_base_no_ext = f"{filename_prefix}{version:03d}"
@@ -981,31 +999,32 @@ def get_shot_info_from_frame(context):
     scene = context.scene
     current_frame = scene.frame_current
 
-    shot_markers = sorted(
-        [m for m in scene.timeline_markers if m.name.startswith("CAM-SC")],
-        key=lambda m: m.frame
-    )
-
-    active_shot_marker = None
-    for m in reversed(shot_markers):
-        if m.frame <= current_frame:
-            active_shot_marker = m
-            break
+    shot_markers, shot_frames = _get_sorted_shot_markers(scene)
 
-    if not active_shot_marker: return None
+    # Binary search over the sorted start frames instead of walking every marker.
+    active_index = bisect_right(shot_frames, current_frame) - 1
+    if active_index < 0: return None
+    active_shot_marker = shot_markers[active_index]
 
     end_frame = scene.frame_end + 1
-    for m in shot_markers:
-        if m.frame > active_shot_marker.frame:
-            end_frame = m.frame
-            break
+    next_index = bisect_right(shot_frames, active_shot_marker.frame)
+    if next_index < len(shot_frames):
+        end_frame = shot_frames[next_index]
 
-    return {"shot_marker": active_shot_marker, "end_frame": end_frame, "duration": end_frame - active_shot_marker.frame}
+    return ShotInfo(active_shot_marker, end_frame, end_frame - active_shot_marker.frame)
+
+def _get_sorted_shot_markers(scene):
+    """
+    Returns the scene's shot markers sorted by frame, plus their frames for bisecting.
+    Always read fresh: marker references must not outlive the call, since undo
+    re-allocates them even when names and frames are unchanged.
+    """
+    shot_markers = [m for m in scene.timeline_markers if SHOT_MARKER_PATTERN.match(m.name)]
+    shot_markers.sort(key=attrgetter("frame"))
+    return shot_markers, [m.frame for m in shot_markers]
 
 def get_all_shots(context):
-    scene = context.scene
-    shot_markers = [m for m in scene.timeline_markers if re.match(r"CAM-SC\d+-SH\d+", m.name, re.IGNORECASE)]
-    return sorted(shot_markers, key=lambda m: m.frame)
+    return _get_sorted_shot_markers(context.scene)[0]
 
 def _purge_orphans():
     """Aggressively purges all orphaned data-blocks."""
@@ -1022,6 +1041,9 @@ def _purge_orphans():
 # --- DEADLINE SUBMISSION HELPER ---
 def _submit_to_deadline(context, filepath, start_frame, end_frame, output_path, deadline_cmd):
     """Submits a specific blend file to Deadline and logs the payload."""
+    # Only needed when actually submitting, keep them out of addon import
+    import subprocess
+    import tempfile
     
     # Path Sanitization: Ensure paths use the canonical drive letter (e.g., S:) on Windows
     if sys.platform.startswith("win"):
@@ -1216,7 +1238,9 @@ class BRENDER_OT_prepare_this_file(bpy.types.Operator):
         filepath = bpy.data.filepath
         filename = os.path.basename(filepath)
 
-        name_match = re.match(r".*-(sc\d+)-.*-(sh\d+)-.*-v\d+\.blend", filename, re.IGNORECASE)
+        # Lazy quantifiers: scan forward to the first SC/SH tokens instead of
+        # running to the end of the name and backtracking.
+        name_match = re.match(r".*?-(sc\d+)-.*?-(sh\d+)-.*?-v\d+\.blend", filename, re.IGNORECASE)
         if not name_match:
             name_match = re.match(r"(SC\d+)-(SH\d+)\.blend", filename, re.IGNORECASE)
 
@@ -1254,7 +1278,7 @@ class BRENDER_OT_refresh_shot_list(bpy.types.Operator):
         for marker in found_shots:
             item = shot_list.add()
             item.name = marker.name
-            name_match = re.match(r"CAM-(SC\d+-SH\d+)", marker.name, re.IGNORECASE)
+            name_match = SHOT_MARKER_ID_PATTERN.match(marker.name)
             if name_match:
                 item.display_name = name_match.group(1)
             else:
@@ -1285,7 +1309,7 @@ class BRENDER_OT_prepare_active_shot(bpy.types.Operator):
             self.report({"ERROR"}, "No active shot marker found at the current frame.")
             return {"CANCELLED"}
 
-        shot_marker = shot_info["shot_marker"]
+        shot_marker = shot_info.shot_marker
         log.info(f"Preparing active shot: {shot_marker.name}")
 
         success, source_scene, name_components = _prepare_shot_in_current_file(context, shot_marker)
@@ -1479,7 +1503,7 @@ def auto_refresh_shot_list(dummy):
         for marker in found_shots:
             item = shot_list.add()
             item.name = marker.name
-            name_match = re.match(r"CAM-(SC\d+-SH\d+)", marker.name, re.IGNORECASE)
+            name_match = SHOT_MARKER_ID_PATTERN.match(marker.name)
             if name_match:
                 item.display_name = name_match.group(1)
             else:
@@ -1620,7 +1644,6 @@ class BRENDER_OT_debug_step_2_find_data(bpy.types.Operator):
         shot_marker = scene.timeline_markers.get(shot_name)
         
         scene.frame_set(shot_marker.frame)
-        context.view_layer.update()
 
         shot_start_frame, shot_end_frame, shot_duration = _get_shot_timing(context, shot_marker)
         source_scene = context.scene
@@ -1703,13 +1726,13 @@ class BRENDER_OT_debug_step_4_add_strips(bpy.types.Operator):
         shot_name_prefix = shot_marker.name 
 
         scene_num_str, shot_num_str = "", ""
-        name_match = re.match(r"CAM-(SC\d+)-(SH\d+)", shot_marker.name, re.IGNORECASE)
+        name_match = SHOT_MARKER_PATTERN.match(shot_marker.name)
         if name_match:
             scene_num_str = name_match.group(1).lower() 
             shot_num_str = name_match.group(2).lower() 
 
         all_strips = getattr(vse_source, 'sequences_all', vse_source.sequences)
-        candidates = sorted([s for s in all_strips if not s.mute], key=lambda s: s.channel, reverse=True)
+        candidates = sorted((s for s in all_strips if not s.mute), key=attrgetter("channel"), reverse=True)
 
         for strip in candidates:
             if strip.name.startswith(shot_name_prefix):
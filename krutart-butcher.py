@@ -15,6 +15,9 @@ import re
 import logging
 import glob
 import time
+import numpy as np
+from bisect import bisect_right
+from operator import attrgetter
 
 from bpy.types import Panel, Operator
 from bpy.props import BoolProperty, StringProperty, IntProperty, EnumProperty, CollectionProperty
@@ -69,6 +72,17 @@ MODE_LABELS = {
     'ART': ("Art", "MATERIAL_DATA"),
 }
 
+# Shot marker patterns, compiled once: they run against every timeline marker
+# in the shot list, retime and relink paths.
+SHOT_MARKER_PATTERN = re.compile(r"CAM-(SC\d+)-(SH\d+)", re.IGNORECASE)
+SHOT_MARKER_ID_PATTERN = re.compile(r"CAM-(SC\d+-SH\d+)", re.IGNORECASE)
+# File naming: '<project#>-...-v###'. Used by every WORK/HERO lookup, some per directory entry.
+VERSION_TAG_PATTERN = re.compile(r"-v\d{3,}")
+VERSION_NUMBER_PATTERN = re.compile(r"-v(\d{3,})")
+VERSION_NUMBER_ICASE_PATTERN = re.compile(r"-v(\d{3,})", re.IGNORECASE)
+PROJECT_NUMBER_PATTERN = re.compile(r"^(\d+)-")
+WORK_DIR_PATTERN = re.compile(r"-WORK", re.IGNORECASE)
+
 
 # --- Core Helper Functions ---
 
@@ -144,14 +158,22 @@ def get_current_user():
     
     return "user"
 
-def _debug_trace(msg):
-    try:
-        import bpy, os
-        if bpy.data.filepath:
-            trace_file = os.path.join(os.path.dirname(bpy.data.filepath), "butcher_crash_trace.txt")
-            with open(trace_file, "a") as f:
-                f.write(msg + "\n")
-    except:
+# Crash tracing appends to a file next to the .blend on every call.
+# Set KRUTART_BUTCHER_TRACE=0 to turn _debug_trace into a no-op at import time.
+CRASH_TRACE_ENABLED = os.environ.get("KRUTART_BUTCHER_TRACE", "1") != "0"
+
+if CRASH_TRACE_ENABLED:
+    def _debug_trace(msg, *args):
+        """Appends a line to the crash trace. Accepts logging-style %-args, formatted only here."""
+        try:
+            if bpy.data.filepath:
+                trace_file = os.path.join(os.path.dirname(bpy.data.filepath), "butcher_crash_trace.txt")
+                with open(trace_file, "a") as f:
+                    f.write((msg % args if args else msg) + "\n")
+        except:
+            pass
+else:
+    def _debug_trace(msg, *args):
         pass
 
 def get_os_bridge(context=None):
@@ -199,9 +221,9 @@ def recursive_purge():
         if current_count == previous_count:
             break
         previous_count = current_count
-        _debug_trace(f"  [PURGE] Running orphans_purge loop {i}...")
+        _debug_trace("  [PURGE] Running orphans_purge loop %s...", i)
         bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
-        _debug_trace(f"  [PURGE] Finished orphans_purge loop {i}.")
+        _debug_trace("  [PURGE] Finished orphans_purge loop %s.", i)
 
 
 def _get_safe_win(context):
@@ -230,22 +252,22 @@ def _safe_remove_collection(context, collection):
                 pass
             # Unlink from scenes
             for s in list(bpy.data.scenes):
-                if collection.name in s.collection.children.keys():
+                if collection.name in s.collection.children:
                     try: 
-                        _debug_trace(f"    [REMOVE_COL] Unlinking {collection.name} from scene {s.name}")
+                        _debug_trace("    [REMOVE_COL] Unlinking %s from scene %s", collection.name, s.name)
                         s.collection.children.unlink(collection)
                     except Exception as e: 
-                        _debug_trace(f"    [REMOVE_COL EXCEPTION] {collection.name} from scene {s.name}: {e}")
+                        _debug_trace("    [REMOVE_COL EXCEPTION] %s from scene %s: %s", collection.name, s.name, e)
             # Unlink from other collections
             for p_col in list(bpy.data.collections):
-                if collection.name in p_col.children.keys():
+                if collection.name in p_col.children:
                     if getattr(p_col, 'override_library', None):
                         continue # Cannot unlink from a parent that is also an override
                     try: 
-                        _debug_trace(f"    [REMOVE_COL] Unlinking {collection.name} from parent {p_col.name}")
+                        _debug_trace("    [REMOVE_COL] Unlinking %s from parent %s", collection.name, p_col.name)
                         p_col.children.unlink(collection)
                     except Exception as e: 
-                        _debug_trace(f"    [REMOVE_COL EXCEPTION] {collection.name} from parent {p_col.name}: {e}")
+                        _debug_trace("    [REMOVE_COL EXCEPTION] %s from parent %s: %s", collection.name, p_col.name, e)
             return
 
         win = _get_safe_win(context)
@@ -270,10 +292,10 @@ def _safe_remove_object(context, obj):
                 if getattr(col, 'override_library', None):
                     continue # Cannot unlink from a parent that is also an override
                 try: 
-                    _debug_trace(f"    [REMOVE_OBJ] Unlinking {obj.name} from {col.name}")
+                    _debug_trace("    [REMOVE_OBJ] Unlinking %s from %s", obj.name, col.name)
                     col.objects.unlink(obj)
                 except Exception as e: 
-                    _debug_trace(f"    [REMOVE_OBJ EXCEPTION] {obj.name} from {col.name}: {e}")
+                    _debug_trace("    [REMOVE_OBJ EXCEPTION] %s from %s: %s", obj.name, col.name, e)
             return
 
         win = _get_safe_win(context)
@@ -288,7 +310,7 @@ def _safe_remove_object(context, obj):
 def parse_shot_filename(filename):
     """
     Parses a filename to extract SC and SH numbers.
-    Fallback purely for mode detection or initial parsing if needed.
+    Matches: ...SC04...SH010... (Case Insensitive)
     """
     match = re.search(r"(sc\d+).+?(sh\d+)", filename, re.IGNORECASE)
     if match:
@@ -304,36 +326,31 @@ def get_active_shot_from_timeline(scene):
     if not hasattr(scene, 'timeline_markers'):
         return None, None
 
-    marker_pattern = re.compile(r"CAM-(SC\d+)-(SH\d+)", re.IGNORECASE)
-    shot_markers = [m for m in scene.timeline_markers if marker_pattern.match(m.name)]
+    shot_markers = [m for m in scene.timeline_markers if SHOT_MARKER_PATTERN.match(m.name)]
     
     if not shot_markers:
         return None, None
         
     # Sort markers chronologically
-    shot_markers.sort(key=lambda m: m.frame)
-    
-    current_frame = scene.frame_current
-    active_marker = None
+    shot_markers.sort(key=attrgetter("frame"))
+    frames = [m.frame for m in shot_markers]
     
-    # Find the last marker that is at or before the current frame
-    for m in shot_markers:
-        if m.frame <= current_frame:
-            active_marker = m
-        else:
-            break
-            
-    # If playhead is before the very first marker, default to the first marker
-    if not active_marker and shot_markers:
-        active_marker = shot_markers[0]
+    # Find the last marker that is at or before the current frame.
+    # If playhead is before the very first marker, default to the first marker.
+    index = bisect_right(frames, scene.frame_current) - 1
+    active_marker = shot_markers[max(index, 0)]
         
-    if active_marker:
-        match = marker_pattern.match(active_marker.name)
-        if match:
-            return match.group(1).upper(), match.group(2).upper()
+    match = SHOT_MARKER_PATTERN.match(active_marker.name)
+    if match:
+        return match.group(1).upper(), match.group(2).upper()
             
     return None, None
 
+# (production_root, SC##) -> resolved SC folder name. Only successful lookups are
+# cached so that folders created later in the session are still discovered; hits
+# are re-checked on disk, and the cache is cleared on file load.
+_PRODUCTION_SC_DIR_CACHE = {}
+
 def get_production_scene_dir(context, sc, sh):
     """
     Uses os_bridge to find the absolute Krutart root, then scans 
@@ -354,25 +371,32 @@ def get_production_scene_dir(context, sc, sh):
     # Step up to the Shared Drives level, then down into PRODUCTION
     shared_drives = mac_root.parent
     production_root = shared_drives / "3212-PRODUCTION"
-    
-    if not production_root.exists():
-        log.warning(f"[DIAG] get_production_scene_dir: PRODUCTION root missing at {production_root}")
-        return None
-        
+
     sc_upper = sc.upper()
     sh_upper = sh.upper()
     search_prefix = f"{sc_upper}-"
-    
-    # 1. Find the SC folder (e.g. SC17-DARKPOINT)
-    sc_dir_name = None
-    for d in production_root.iterdir():
-        if d.is_dir() and d.name.upper().startswith(search_prefix):
-            sc_dir_name = d.name
-            break
-            
+    cache_key = (str(production_root), sc_upper)
+
+    sc_dir_name = _PRODUCTION_SC_DIR_CACHE.get(cache_key)
+    if sc_dir_name and not (production_root / sc_dir_name).is_dir():
+        # Renamed or replaced on the share (e.g. a new [version]): rescan.
+        del _PRODUCTION_SC_DIR_CACHE[cache_key]
+        sc_dir_name = None
     if not sc_dir_name:
-        log.warning(f"[DIAG] get_production_scene_dir: Could not find SC folder starting with {search_prefix} in {production_root}")
-        return None
+        if not production_root.exists():
+            log.warning(f"[DIAG] get_production_scene_dir: PRODUCTION root missing at {production_root}")
+            return None
+
+        # 1. Find the SC folder (e.g. SC17-DARKPOINT)
+        for d in production_root.iterdir():
+            if d.name.upper().startswith(search_prefix) and d.is_dir():
+                sc_dir_name = d.name
+                break
+
+        if not sc_dir_name:
+            log.warning(f"[DIAG] get_production_scene_dir: Could not find SC folder starting with {search_prefix} in {production_root}")
+            return None
+        _PRODUCTION_SC_DIR_CACHE[cache_key] = sc_dir_name
         
     # 2. Find the SH folder inside that (e.g. SC17-SH010)
     sh_target = f"{sc_upper}-{sh_upper}"
@@ -389,12 +413,16 @@ def _make_visible_recursive(col):
     """
     for obj in col.objects:
         try:
-            # Ensure basic visibility
-            obj.hide_viewport = False
-            obj.hide_render = False
+            # Ensure basic visibility. Only write flags that are actually set:
+            # every hide_* write runs an RNA update that resyncs the view layer bases.
+            if obj.hide_viewport:
+                obj.hide_viewport = False
+            if obj.hide_render:
+                obj.hide_render = False
             
             # CRITICAL: Reset selectability (often locked in ANI-REFERENCE)
-            obj.hide_select = False
+            if obj.hide_select:
+                obj.hide_select = False
             
             # MATERIAL FIX: If material alpha is 0, Workbench/Solid mode shows only an outline.
             if hasattr(obj.data, "materials"):
@@ -490,19 +518,23 @@ def _prepare_references(context, mode):
     all_shots = get_all_butcher_shots(context)
     shot_numbers = []
     for marker in all_shots:
-        match = re.match(r"CAM-SC\d+-(SH\d+)", marker.name, re.IGNORECASE)
+        match = SHOT_MARKER_PATTERN.match(marker.name)
         if match:
-            shot_numbers.append(match.group(1).upper())
+            shot_numbers.append(match.group(2).upper())
 
-    # For each shot, create wrapper and move content
+    # For each shot, create wrapper and move content.
+    # Both per-shot lookups go through one name snapshot of bpy.data.collections
+    # instead of two global by-name searches per shot; new wrappers are added to it.
+    collections_by_name = {c.name: c for c in bpy.data.collections}
     for sh_num in shot_numbers:
         shot_ref_name = f"VFX-REFERENCE-{sc_prefix}-{sh_num}"
-        shot_ref_col = bpy.data.collections.get(shot_ref_name)
+        shot_ref_col = collections_by_name.get(shot_ref_name)
         if not shot_ref_col:
             shot_ref_col = bpy.data.collections.new(shot_ref_name)
             vfx_ref_col.children.link(shot_ref_col)
+            collections_by_name[shot_ref_name] = shot_ref_col
 
-        src_vfx_shot = bpy.data.collections.get(f"VFX-{sc_prefix}-{sh_num}")
+        src_vfx_shot = collections_by_name.get(f"VFX-{sc_prefix}-{sh_num}")
         if src_vfx_shot:
             # PATCH: Changed delete_src to False to leave the wrapper collections intact
             _move_collection_contents(src_vfx_shot, shot_ref_col, delete_src=False)
@@ -520,22 +552,33 @@ def _prepare_references(context, mode):
                 
     log.info(f"Prepared references for {base_name}")
 
+def _link_into_parents(parents, child_cols, objs):
+    """
+    Links child_cols and objs into every collection in parents that doesn't hold them yet.
+    Works parent by parent: each parent's current members are read into a set once, instead
+    of a by-name lookup in its children/objects for every (item, parent) pair.
+    """
+    for parent in parents:
+        if child_cols:
+            parent_children = parent.children
+            linked = set(parent_children)
+            for child_col in child_cols:
+                if child_col not in linked:
+                    parent_children.link(child_col)
+        if objs:
+            parent_objects = parent.objects
+            linked = set(parent_objects)
+            for obj in objs:
+                if obj not in linked:
+                    parent_objects.link(obj)
+
 def _simple_delete_collection(context, col):
     """Helper to merge collection contents into parents before deleting it (Unzip)"""
-    parent_scenes = [s for s in bpy.data.scenes if col.name in s.collection.children.keys()]
-    parent_collections = [pcol for pcol in bpy.data.collections if col.name in pcol.children.keys()]
-    
-    for child_col in list(col.children):
-        for s in parent_scenes:
-            if child_col.name not in s.collection.children.keys(): s.collection.children.link(child_col)
-        for pcol in parent_collections:
-            if child_col.name not in pcol.children.keys(): pcol.children.link(child_col)
-            
-    for obj in list(col.objects):
-        for s in parent_scenes:
-            if obj.name not in s.collection.objects.keys(): s.collection.objects.link(obj)
-        for pcol in parent_collections:
-            if obj.name not in pcol.objects.keys(): pcol.objects.link(obj)
+    col_name = col.name
+    parents = [s.collection for s in bpy.data.scenes if col_name in s.collection.children]
+    parents.extend(pcol for pcol in bpy.data.collections if col_name in pcol.children)
+    
+    _link_into_parents(parents, list(col.children), list(col.objects))
             
     try: _safe_remove_collection(context, col)
     except Exception as e:
@@ -554,13 +597,13 @@ def _save_loc_work(context):
     name_lower = name_part.lower()
 
     # Find and cleanly strip any old version number to get the pure base name
-    version_match = re.search(r'-v\d{3,}', name_lower)
+    version_match = VERSION_TAG_PATTERN.search(name_lower)
     if version_match:
         before_version_part = name_lower[:version_match.start()]
     else:
         before_version_part = name_lower
 
-    project_match = re.match(r'^(\d+)-', before_version_part)
+    project_match = PROJECT_NUMBER_PATTERN.match(before_version_part)
     if True:
         if project_match:
             project_name = project_match.group(1)
@@ -605,7 +648,7 @@ def _save_loc_work(context):
         existing_files = glob.glob(os.path.join(target_dir, "*.blend"))
         for f in existing_files:
             fname = os.path.basename(f).lower()
-            v_match = re.search(r'-v(\d{3,})', fname)
+            v_match = VERSION_NUMBER_PATTERN.search(fname)
             if v_match:
                 highest_version = max(highest_version, int(v_match.group(1)))
         
@@ -651,10 +694,10 @@ def _loc_extract_scene(context):
                 pass
             else:
                 try:
-                    _debug_trace(f"    [_delete_hierarchy] REMOVING OBJ: {obj.name}")
+                    _debug_trace("    [_delete_hierarchy] REMOVING OBJ: %s", obj.name)
                     _safe_remove_object(context, obj)
                 except Exception as e:
-                    _debug_trace(f"    [_delete_hierarchy] EXCEPTION ON OBJ: {obj.name} -> {e}")
+                    _debug_trace("    [_delete_hierarchy] EXCEPTION ON OBJ: %s -> %s", obj.name, e)
 
         # Delete the collection itself
         if context.scene.butcher_debug_mode:
@@ -673,58 +716,42 @@ def _loc_extract_scene(context):
                 pass
 
     # Delete Hierarchy targets
-    delete_hierarchy_patterns = [
-        re.compile(r"^ANI-REFERENCE-", re.IGNORECASE),
-        re.compile(r"^ART-REFERENCE-", re.IGNORECASE),
-        re.compile(r"^VFX-REFERENCE-", re.IGNORECASE),
-        re.compile(r"^\+ANI-SC", re.IGNORECASE),
-        re.compile(r"^SHOT-ART-", re.IGNORECASE),
-        re.compile(r"^SHOT-VFX-", re.IGNORECASE),
-        re.compile(r"^LGT-REFERENCE", re.IGNORECASE)
-    ]
+    # Plain prefixes, tested against the upper-cased name: one startswith() call
+    # instead of a case-insensitive regex per pattern.
+    delete_hierarchy_prefixes = (
+        "ANI-REFERENCE-",
+        "ART-REFERENCE-",
+        "VFX-REFERENCE-",
+        "+ANI-SC",
+        "SHOT-ART-",
+        "SHOT-VFX-",
+        "LGT-REFERENCE",
+    )
 
     def _unzip_collection(coll):
-        parent_scenes = [scene for scene in bpy.data.scenes if coll.name in scene.collection.children.keys()]
-        parent_collections = [pcol for pcol in bpy.data.collections if coll.name in pcol.children.keys()]
-        
-        for child_col in list(coll.children):
-            if context.scene.butcher_debug_mode:
-                log.info(f"[DRY RUN] Would reparent child collection '{child_col.name}' to parents of '{coll.name}'")
-            else:
-                for scene in parent_scenes:
-                    if child_col.name not in scene.collection.children.keys():
-                        scene.collection.children.link(child_col)
-                for pcol in parent_collections:
-                    if child_col.name not in pcol.children.keys():
-                        pcol.children.link(child_col)
-
-        for obj in list(coll.objects):
-            if context.scene.butcher_debug_mode:
-                pass # Too noisy to log every object
-            else:
-                for scene in parent_scenes:
-                    if obj.name not in scene.collection.objects.keys():
-                        scene.collection.objects.link(obj)
-                for pcol in parent_collections:
-                    if obj.name not in pcol.objects.keys():
-                        pcol.objects.link(obj)
+        coll_name = coll.name
+        if context.scene.butcher_debug_mode:
+            # Objects are too noisy to log one by one.
+            for child_col in coll.children:
+                log.info(f"[DRY RUN] Would reparent child collection '{child_col.name}' to parents of '{coll_name}'")
+        else:
+            parents = [scene.collection for scene in bpy.data.scenes if coll_name in scene.collection.children]
+            parents.extend(pcol for pcol in bpy.data.collections if coll_name in pcol.children)
+            _link_into_parents(parents, list(coll.children), list(coll.objects))
         
         # Now truly delete the container collection wrapper
         if context.scene.butcher_debug_mode:
             log.info(f"[DRY RUN] Would UNZIP (delete wrapper) collection: {coll.name}")
         else:
             try:
-                _debug_trace(f"    [_unzip_collection] DELETING COLLECTION WRAPPER: {coll.name}")
+                _debug_trace("    [_unzip_collection] DELETING COLLECTION WRAPPER: %s", coll.name)
                 _safe_remove_collection(context, coll)
             except Exception as e:
-                _debug_trace(f"    [_unzip_collection] EXCEPTION: {coll.name} -> {e}")
+                _debug_trace("    [_unzip_collection] EXCEPTION: %s -> %s", coll.name, e)
 
 
     # Unzip Delete targets (e.g. +ART-, +VFX-)
-    unzip_delete_patterns = [
-        re.compile(r"^\+ART-", re.IGNORECASE),
-        re.compile(r"^\+VFX-", re.IGNORECASE)
-    ]
+    unzip_delete_prefixes = ("+ART-", "+VFX-")
 
     for col in list(bpy.data.collections):
         try:
@@ -732,13 +759,15 @@ def _loc_extract_scene(context):
         except ReferenceError:
             continue
         
+        cname_upper = cname.upper()
+        
         # Check hierarchy delete
-        if any(p.match(cname) for p in delete_hierarchy_patterns):
+        if cname_upper.startswith(delete_hierarchy_prefixes):
             _delete_hierarchy(col)
             continue
             
         # Check Unzip delete
-        if any(p.match(cname) for p in unzip_delete_patterns):
+        if cname_upper.startswith(unzip_delete_prefixes):
             _unzip_collection(col)
 
     # Scene cleanups
@@ -844,13 +873,13 @@ def _save_loc_hero(context):
     mac_root = os_bridge.get_mac_root(context) if os_bridge else None
     
     if mac_root:
-        hero_dir = re.sub(r"-WORK", "-HERO", dir_path, flags=re.IGNORECASE)
+        hero_dir = WORK_DIR_PATTERN.sub("-HERO", dir_path)
     else:
-        hero_dir = re.sub(r"-WORK", "-HERO", dir_path, flags=re.IGNORECASE)
+        hero_dir = WORK_DIR_PATTERN.sub("-HERO", dir_path)
 
     # 2. Format Filename exactly: project-loc-cleanAsset-hero.blend
     name_lower = name_part.lower()
-    version_match = re.search(r'-v\d{3,}', name_lower)
+    version_match = VERSION_TAG_PATTERN.search(name_lower)
 
     if version_match:
         base_name = name_lower[:version_match.start()]
@@ -913,7 +942,7 @@ def _save_workflow_work(context, mode_tag, suffix_tag):
     name_lower = name_part.lower()
 
     # Find and cleanly strip any old version number to get the pure base name
-    version_match = re.search(r'-v\d{3,}', name_lower)
+    version_match = VERSION_TAG_PATTERN.search(name_lower)
     if version_match:
         before_version_part = name_lower[:version_match.start()]
     else:
@@ -923,7 +952,7 @@ def _save_workflow_work(context, mode_tag, suffix_tag):
     if not sc or not sh:
         raise Exception("Could not detect active shot from Timeline Markers. Make sure the playhead is over a CAM-SC##-SH### marker.")
         
-    project_match = re.match(r"^(\d+)-", name_lower)
+    project_match = PROJECT_NUMBER_PATTERN.match(name_lower)
     project_id = project_match.group(1) if project_match else "3212"
 
     sc_upper = sc.upper()
@@ -950,7 +979,7 @@ def _save_workflow_work(context, mode_tag, suffix_tag):
     
     for f in existing_files:
         fname = os.path.basename(f).lower()
-        v_match = re.search(r'-v(\d{3,})', fname)
+        v_match = VERSION_NUMBER_PATTERN.search(fname)
         if v_match:
             highest_version = max(highest_version, int(v_match.group(1)))
                 
@@ -1014,7 +1043,7 @@ def _save_workflow_hero(context, mode_tag, create_blocking=False):
     name_part, ext = os.path.splitext(filename)
     name_lower = name_part.lower()
     
-    project_match = re.match(r"^(\d+)-", name_lower)
+    project_match = PROJECT_NUMBER_PATTERN.match(name_lower)
     project_id = project_match.group(1) if project_match else "3212"
     sc, sh = get_active_shot_from_timeline(context.scene)
     if not sc or not sh:
@@ -1062,17 +1091,20 @@ def _save_workflow_hero(context, mode_tag, create_blocking=False):
         bpy.ops.wm.save_as_mainfile(filepath=filepath, copy=False)
 
     # --- VERSION TRACKING HANDSHAKE & DIAGNOSTICS ---
-    version_match = re.search(r'-v(\d{3,})', name_lower)
+    version_match = VERSION_NUMBER_PATTERN.search(name_lower)
     target_col_name = f"+{mode_tag}+"
     target_col = bpy.data.collections.get(target_col_name)
     injected_prop = False
 
     # Force print to external trace file
-    _debug_trace(f"--- HANDSHAKE DIAGNOSTICS FOR: {new_filename} ---")
-    _debug_trace(f"  > name_lower: {name_lower}")
-    _debug_trace(f"  > version_match: {'FOUND (v' + version_match.group(1) + ')' if version_match else 'NONE'}")
-    _debug_trace(f"  > target_col_name expected: {target_col_name}")
-    _debug_trace(f"  > target_col found in bpy.data: {'YES' if target_col else 'NO'}")
+    _debug_trace("--- HANDSHAKE DIAGNOSTICS FOR: %s ---", new_filename)
+    _debug_trace("  > name_lower: %s", name_lower)
+    if version_match:
+        _debug_trace("  > version_match: FOUND (v%s)", version_match.group(1))
+    else:
+        _debug_trace("  > version_match: NONE")
+    _debug_trace("  > target_col_name expected: %s", target_col_name)
+    _debug_trace("  > target_col found in bpy.data: %s", "YES" if target_col else "NO")
 
     if version_match and target_col:
         version_str = f"v{version_match.group(1)}"
@@ -1126,7 +1158,7 @@ def _save_workflow_hero(context, mode_tag, create_blocking=False):
         name_lower = name_part.lower()
 
         # Strip existing version tags to get the clean base name
-        version_match = re.search(r'-v\d{3,}', name_lower)
+        version_match = VERSION_TAG_PATTERN.search(name_lower)
         if version_match:
             base_name = name_lower[:version_match.start()]
         else:
@@ -1136,7 +1168,7 @@ def _save_workflow_hero(context, mode_tag, create_blocking=False):
         existing_files = glob.glob(os.path.join(current_dir, "*.blend"))
         highest_version = -1
         for f in existing_files:
-            v_match = re.search(r'-v(\d{3,})', os.path.basename(f), re.IGNORECASE)
+            v_match = VERSION_NUMBER_ICASE_PATTERN.search(os.path.basename(f))
             if v_match:
                 highest_version = max(highest_version, int(v_match.group(1)))
                 
@@ -1196,11 +1228,11 @@ def _art_extract_scene(context):
         if cname.upper().startswith("LGT-REFERENCE"):
             # Unlink from other parents safely
             for parent in list(bpy.data.collections):
-                if col.name in parent.children.keys():
+                if col.name in parent.children:
                     if getattr(parent, 'override_library', None):
                         continue
                     parent.children.unlink(col)
-            if col.name not in context.scene.collection.children.keys():
+            if col.name not in context.scene.collection.children:
                 context.scene.collection.children.link(col)
 
     for s in list(bpy.data.scenes):
@@ -1234,15 +1266,16 @@ def _art_extract_scene(context):
                     survivor.name = f"GARBAGE_{cname}_{random.randint(1000, 9999)}"
             except: pass
 
-    hierarchy_delete_patterns = [
-        re.compile(r"^ANI-REFERENCE-", re.IGNORECASE),
-        re.compile(r"^\+ANI-", re.IGNORECASE),
-        re.compile(r"^\+VFX-", re.IGNORECASE),
-        re.compile(r"^\+ENV-", re.IGNORECASE),
-        re.compile(r"^\+LOC-", re.IGNORECASE),
-        re.compile(r"^ART-REFERENCE-", re.IGNORECASE),
-        re.compile(r"^VFX-REFERENCE-", re.IGNORECASE)
-    ]
+    # Matched against the upper-cased name, so plain prefixes replace the IGNORECASE regexes.
+    hierarchy_delete_prefixes = (
+        "ANI-REFERENCE-",
+        "+ANI-",
+        "+VFX-",
+        "+ENV-",
+        "+LOC-",
+        "ART-REFERENCE-",
+        "VFX-REFERENCE-",
+    )
     
     active_shot_model_col = f"MODEL-SC{sc[2:]}-SH{sh[2:]}".upper() if (sc and sh) else ""
     if active_shot_model_col and not bpy.data.collections.get(active_shot_model_col):
@@ -1256,7 +1289,7 @@ def _art_extract_scene(context):
         if cname_upper.startswith("LGT-REFERENCE"):
             continue # Safeguard pro ART workflow
 
-        if any(p.search(cname) for p in hierarchy_delete_patterns):
+        if cname_upper.startswith(hierarchy_delete_prefixes):
             _delete_hierarchy(col)
             continue
             
@@ -1315,19 +1348,14 @@ def _art_reorganize(context):
     
     # PATCH: Constrain search to collections actively linked to the current scene's root
     # and enforce matching the current scene's SC prefix if available.
+    # Fallback to any +ART-SC root if the timeline marker sc/sh parsing failed.
+    art_root_prefix = f"+ART-{sc.upper()}" if sc else "+ART-SC"
     for col in list(scene.collection.children):
         cname_upper = col.name.upper()
         
         # Determine if this collection is the correct ART root for this specific shot
-        is_match = False
-        if sc and cname_upper.startswith(f"+ART-{sc.upper()}"):
-            is_match = True
-        elif not sc and cname_upper.startswith("+ART-SC"):
-            # Fallback if the timeline marker sc/sh parsing failed
-            is_match = True
-
-        if is_match:
-            _debug_trace(f"    [_art_reorganize] Found and renaming ART root: {col.name}")
+        if cname_upper.startswith(art_root_prefix):
+            _debug_trace("    [_art_reorganize] Found and renaming ART root: %s", col.name)
             
             # --- EXTRACT AND STORE ENV TARGET ---
             clean_name = cname_upper.strip('+')
@@ -1336,7 +1364,7 @@ def _art_reorganize(context):
             if len(parts) >= 3 and parts[0] == "ART" and parts[1].startswith("SC"):
                 env_target = "-".join(parts[2:])
                 context.scene["butcher_env_target"] = env_target
-                _debug_trace(f"    [_art_reorganize] Stored env_target: {env_target}")
+                _debug_trace("    [_art_reorganize] Stored env_target: %s", env_target)
                 
             _merge_collection_to_target(col, "+ART+")
             art_root = bpy.data.collections.get("+ART+")
@@ -1356,15 +1384,15 @@ def _art_reorganize(context):
          
     local_col = bpy.data.collections.get(active_shot_model_col_name)
     if local_col:
-        _debug_trace(f"    [_art_reorganize] Found local shot collection: {local_col.name}")
+        _debug_trace("    [_art_reorganize] Found local shot collection: %s", local_col.name)
         
         is_linked = local_col.library is not None or getattr(local_col, 'override_library', None) is not None
         
         if not is_linked:
-            _debug_trace(f"    [_art_reorganize] Renaming local collection to 'LOCAL'")
+            _debug_trace("    [_art_reorganize] Renaming local collection to 'LOCAL'")
             local_col.name = "LOCAL"
         else:
-            _debug_trace(f"    [_art_reorganize] SKIP RENAME for Linked/Override collection: {local_col.name}")
+            _debug_trace("    [_art_reorganize] SKIP RENAME for Linked/Override collection: %s", local_col.name)
         
     if art_root:
         std_col = bpy.data.collections.get("STD")
@@ -1381,25 +1409,25 @@ def _art_reorganize(context):
             
         if local_col:
             for parent in list(bpy.data.collections):
-                if local_col.name in parent.children.keys():
+                if local_col.name in parent.children:
                     if getattr(parent, 'override_library', None):
-                        _debug_trace(f"    [_art_reorganize] SKIP Unlink {local_col.name} from OVERRIDE parent: {parent.name}")
+                        _debug_trace("    [_art_reorganize] SKIP Unlink %s from OVERRIDE parent: %s", local_col.name, parent.name)
                         continue
-                    _debug_trace(f"    [_art_reorganize] Unlinking {local_col.name} from parent: {parent.name}")
+                    _debug_trace("    [_art_reorganize] Unlinking %s from parent: %s", local_col.name, parent.name)
                     parent.children.unlink(local_col)
             
-            if local_col.name in context.scene.collection.children.keys():
-                _debug_trace(f"    [_art_reorganize] Unlinking {local_col.name} from Scene Root")
+            if local_col.name in context.scene.collection.children:
+                _debug_trace("    [_art_reorganize] Unlinking %s from Scene Root", local_col.name)
                 context.scene.collection.children.unlink(local_col)
                 
-            if local_col.name not in std_col.children.keys():
-                _debug_trace(f"    [_art_reorganize] Linking {local_col.name} to STD")
+            if local_col.name not in std_col.children:
+                _debug_trace("    [_art_reorganize] Linking %s to STD", local_col.name)
                 std_col.children.link(local_col)
             
-            _debug_trace(f"    [_art_reorganize] Recursively unhiding and enabling selection in {local_col.name}...")
+            _debug_trace("    [_art_reorganize] Recursively unhiding and enabling selection in %s...", local_col.name)
             _make_visible_recursive(local_col)
 
-            _debug_trace(f"    [_art_reorganize] Setting collection visibility: {local_col.name}")
+            _debug_trace("    [_art_reorganize] Setting collection visibility: %s", local_col.name)
             local_col.hide_viewport = False
             local_col.hide_render = False
 
@@ -1415,25 +1443,25 @@ def _art_reorganize(context):
                         return True
                 return False
 
-            _debug_trace(f"    [_art_reorganize] Recursively un-excluding layer collection: {local_col.name}")
+            _debug_trace("    [_art_reorganize] Recursively un-excluding layer collection: %s", local_col.name)
             recursive_unrestrict_layer(context.view_layer.layer_collection, local_col.name)
-            _debug_trace(f"    [_art_reorganize] Finished reorganization for {local_col.name}")
+            _debug_trace("    [_art_reorganize] Finished reorganization for %s", local_col.name)
             
         # Reparent LGT-REFERENCE correctly inside +ART+
         for col in list(bpy.data.collections):
             if col.name.upper().startswith("LGT-REFERENCE"):
-                _debug_trace(f"    [_art_reorganize] Moving {col.name} to {art_root.name}")
+                _debug_trace("    [_art_reorganize] Moving %s to %s", col.name, art_root.name)
                 
                 for parent in list(bpy.data.collections):
-                    if col.name in parent.children.keys():
+                    if col.name in parent.children:
                         if getattr(parent, 'override_library', None):
                             continue
                         parent.children.unlink(col)
                 
-                if col.name in context.scene.collection.children.keys():
+                if col.name in context.scene.collection.children:
                     context.scene.collection.children.unlink(col)
                     
-                if col.name not in art_root.children.keys():
+                if col.name not in art_root.children:
                     art_root.children.link(col)
 
 def _art_retime(context):
@@ -1498,20 +1526,15 @@ def _ani_extract_scene(context):
             except: pass
 
     # Delete collections matching patterns
-    hierarchy_delete_patterns = [
-        re.compile(r"^\+ART-", re.IGNORECASE),
-        re.compile(r"^\+ENV-", re.IGNORECASE),
-        re.compile(r"^\+LOC-", re.IGNORECASE)
-    ]
+    hierarchy_delete_prefixes = ("+ART-", "+ENV-", "+LOC-")
     
-    simple_delete_patterns = [
-        re.compile(r"^SHOT-ANI-SC", re.IGNORECASE), # Removed trailing dash to catch SHOT-ANI-SC09-ON_MOON
-        re.compile(r"^\+SC", re.IGNORECASE),
-        re.compile(r"^SHOT-VFX-SC", re.IGNORECASE)
+    simple_delete_prefixes = (
+        "SHOT-ANI-SC", # Removed trailing dash to catch SHOT-ANI-SC09-ON_MOON
+        "+SC",
+        "SHOT-VFX-SC",
         # PATCH: Odstraněno plošné rozbalování (unzip) generického "VFX-SC...", bude se mazat kompletně
-    ]
+    )
     
-    cam_pattern = re.compile(r"^CAM-SC", re.IGNORECASE)
     active_cam_str = f"CAM-{sc}-{sh}".upper() if (sc and sh) else ""
     active_vfx_shot_col = f"VFX-{sc}-{sh}".upper() if (sc and sh) else ""
     active_shot_str = f"{sc}-{sh}".upper() if (sc and sh) else ""
@@ -1522,7 +1545,7 @@ def _ani_extract_scene(context):
         cname_upper = cname.upper()
         
         # Check standard hierarchy deletes
-        if any(p.search(cname) for p in hierarchy_delete_patterns):
+        if cname_upper.startswith(hierarchy_delete_prefixes):
             _delete_hierarchy(col)
             continue
             
@@ -1558,7 +1581,7 @@ def _ani_extract_scene(context):
             continue
 
         # Check simple collection deletes (flatten out child collections)
-        if any(p.search(cname) for p in simple_delete_patterns):
+        if cname_upper.startswith(simple_delete_prefixes):
             if context.scene.butcher_debug_mode:
                 log.info(f"[DRY RUN] Would simple-delete collection: {col.name}")
             else:
@@ -1566,7 +1589,7 @@ def _ani_extract_scene(context):
             continue
             
         # Check CAM deletes
-        if cam_pattern.search(cname) and active_cam_str:
+        if cname_upper.startswith("CAM-SC") and active_cam_str:
             # Preserve exact match OR sub-collections of the active shot
             if cname_upper == active_cam_str or cname_upper.startswith(active_cam_str + "-"):
                 continue
@@ -1631,7 +1654,7 @@ def _ani_reorganize(context):
         
         if cname_upper.startswith("+VFX-SC"):
             _merge_collection_to_target(col, "+VFX+")
-            _debug_trace(f"    [_ani_reorganize] Ensuring visibility for +VFX+")
+            _debug_trace("    [_ani_reorganize] Ensuring visibility for +VFX+")
             tgt = bpy.data.collections.get("+VFX+")
             if tgt:
                 _make_visible_recursive(tgt)
@@ -1658,17 +1681,12 @@ def _ani_retime(context):
         return
         
     target_marker_name = f"CAM-{sc}-{sh}".upper()
-    markers = sorted(list(scene.timeline_markers), key=lambda m: m.frame)
-    
-    start_marker = None
-    end_marker = None
     
-    for i, m in enumerate(markers):
-        if m.name.upper() == target_marker_name:
-            start_marker = m
-            if i + 1 < len(markers):
-                end_marker = markers[i+1]
-            break
+    # One pass over the sorted markers: the end marker is simply the next item
+    # after the start marker, so no index bookkeeping is needed.
+    markers = iter(sorted(scene.timeline_markers, key=attrgetter("frame")))
+    start_marker = next((m for m in markers if m.name.upper() == target_marker_name), None)
+    end_marker = next(markers, None) if start_marker else None
             
     if not start_marker:
         log.warning(f"Could not find start marker {target_marker_name}")
@@ -1688,34 +1706,51 @@ def _ani_retime(context):
         if m not in safe_markers:
             scene.timeline_markers.remove(m)
             
-    # 2. Shift markers
-    for m in safe_markers:
-        m.frame += shift_amount
-        
     if end_marker:
         end_marker.name = "END"
-        
-    # 3. Shift Actions
-    for action in bpy.data.actions:
-        for fcurve in action.fcurves:
-            for key in fcurve.keyframe_points:
-                key.co[0] += shift_amount
-                key.handle_left[0] += shift_amount
-                key.handle_right[0] += shift_amount
+
+    # Shot already starts at 1001: skip rewriting every marker, key, GP frame and strip.
+    if shift_amount:
+        # 2. Shift markers
+        for m in safe_markers:
+            m.frame += shift_amount
+        
+        # 3. Shift Actions
+        # Read/write each fcurve's keys in bulk (flat [x0, y0, x1, y1, ...] float32
+        # buffers, matching Blender's storage) instead of three attribute round-trips per keyframe.
+        # One buffer per fcurve serves all three attributes; foreach_get overwrites it fully.
+        for action in bpy.data.actions:
+            for fcurve in action.fcurves:
+                keyframe_points = fcurve.keyframe_points
+                key_count = len(keyframe_points)
+                if not key_count:
+                    continue
+                values = np.empty(key_count * 2, dtype=np.float32)
+                for attr in ("co", "handle_left", "handle_right"):
+                    keyframe_points.foreach_get(attr, values)
+                    values[0::2] += shift_amount
+                    keyframe_points.foreach_set(attr, values)
                 
-    # 4. Shift Grease Pencil
-    for gp in bpy.data.grease_pencils:
-        for layer in gp.layers:
-            for frame in layer.frames:
-                frame.frame_number += shift_amount
+        # 4. Shift Grease Pencil
+        # Same bulk read/modify/write as the actions above, one int buffer per layer.
+        for gp in bpy.data.grease_pencils:
+            for layer in gp.layers:
+                frames = layer.frames
+                frame_count = len(frames)
+                if not frame_count:
+                    continue
+                frame_numbers = np.empty(frame_count, dtype=np.int32)
+                frames.foreach_get("frame_number", frame_numbers)
+                frame_numbers += shift_amount
+                frames.foreach_set("frame_number", frame_numbers)
                 
-    # 5. Shift Video Sequencer Strips (Guides)
-    if scene.sequence_editor:
-        for strip in scene.sequence_editor.sequences_all:
-            try:
-                strip.frame_start += shift_amount
-            except Exception as e:
-                log.warning(f"Could not shift VSE strip {strip.name}: {e}")
+        # 5. Shift Video Sequencer Strips (Guides)
+        if scene.sequence_editor:
+            for strip in scene.sequence_editor.sequences_all:
+                try:
+                    strip.frame_start += shift_amount
+                except Exception as e:
+                    log.warning(f"Could not shift VSE strip {strip.name}: {e}")
                 
     # 6. Set scene range
     scene.frame_start = 1001
@@ -1769,38 +1804,37 @@ def _ani_project_settings(context):
             
     # Lock selectability and visibility for all references
     reference_prefixes = ["ANI-REFERENCE", "ART-REFERENCE", "VFX-REFERENCE"]
+
+    # Flat name -> LayerCollection index of the active view layer, built in one walk
+    # instead of one recursive tree search per reference collection. setdefault keeps
+    # the first pre-order match, which is what the recursive search returned.
+    layer_cols_by_name = {}
+    stack = [context.view_layer.layer_collection]
+    while stack:
+        layer_col = stack.pop()
+        layer_cols_by_name.setdefault(layer_col.name, layer_col)
+        stack.extend(reversed(layer_col.children[:]))
+
     for col in bpy.data.collections:
         if any(col.name.upper().startswith(prefix) for prefix in reference_prefixes):
-            col.hide_select = True
-            col.hide_viewport = False
-            col.hide_render = True
+            # Only write flags that differ: each hide_*/exclude write runs an RNA update
+            # that resyncs the view layer, even when the value doesn't change.
+            if not col.hide_select:
+                col.hide_select = True
+            if col.hide_viewport:
+                col.hide_viewport = False
+            if not col.hide_render:
+                col.hide_render = True
             
             # Disable exclusion in the active view layer (forces the checkmark ON)
-            def recursive_unexclude(layer_col, target_name):
-                if layer_col.name == target_name:
-                    layer_col.exclude = False
-                    return True
-                for child in layer_col.children:
-                    if recursive_unexclude(child, target_name):
-                        return True
-                return False
-
-            recursive_unexclude(context.view_layer.layer_collection, col.name)
+            layer_col = layer_cols_by_name.get(col.name)
+            if layer_col and layer_col.exclude:
+                layer_col.exclude = False
 
 def _ani_purge_data(context):
     _loc_aggressive_purge(context)
 
 
-def parse_shot_filename(filename):
-    """
-    Parses a filename to extract SC and SH numbers.
-    Matches: ...SC04...SH010... (Case Insensitive)
-    """
-    match = re.search(r"(sc\d+).+?(sh\d+)", filename, re.IGNORECASE)
-    if match:
-        return match.group(1).upper(), match.group(2).upper()
-    return None, None
-
 def _get_dynamic_target_dir(dir_path, filename, mode, default_folder):
     """
     Determines the target directory based on the filename and mode.
@@ -1848,9 +1882,11 @@ def _perform_save_as(context, folder_name, suffix_check, suffix_add, mode):
         log.info(f"[DRY RUN] Would save {mode} file to: {new_filepath}")
         return
 
-    if not os.path.exists(target_dir):
+    try:
         os.makedirs(target_dir)
         log.info(f"Created directory: {target_dir}")
+    except FileExistsError:
+        pass
     
     bpy.ops.wm.save_as_mainfile(filepath=new_filepath, copy=False)
     log.info(f"Switched to {mode} file: {new_filepath}")
@@ -1896,15 +1932,15 @@ def _clean_collections(context, keep_keywords, remove_regex_list):
 
 def _clean_objects(context, remove_types, clear_animation=True):
     objs_to_remove = []
+    # Dry runs never clear animation (too noisy to log every clear), so resolve the
+    # debug flag once and skip the per-object animation_data read entirely.
+    clear_animation = clear_animation and not context.scene.butcher_debug_mode
     for obj in bpy.data.objects:
         if obj.type in remove_types:
             objs_to_remove.append(obj)
             continue
         if clear_animation and obj.animation_data:
-            if context.scene.butcher_debug_mode:
-                 pass # Too noisy to log every animation clear
-            else:
-                 obj.animation_data_clear()
+            obj.animation_data_clear()
             
     for obj in objs_to_remove:
         if context.scene.butcher_debug_mode:
@@ -2224,7 +2260,7 @@ def _find_workflow_hero_filepath(context, sc, sh, mode_tag, master_file_path=Non
     sh_upper = sh.upper()
     
     filename = os.path.basename(master_file_path if master_file_path else bpy.data.filepath)
-    project_match = re.match(r"^(\d+)-", filename.lower())
+    project_match = PROJECT_NUMBER_PATTERN.match(filename.lower())
     project_id = project_match.group(1) if project_match else "3212"
     
     master_sh_dir = get_production_scene_dir(context, sc_upper, sh_upper)
@@ -2243,7 +2279,7 @@ def _find_loc_hero_filepath(context, loc_name, master_file_path=None):
     loc_name_lower = loc_name.lower()
     
     filename = os.path.basename(master_file_path if master_file_path else bpy.data.filepath)
-    project_match = re.match(r"^(\d+)-", filename.lower())
+    project_match = PROJECT_NUMBER_PATTERN.match(filename.lower())
     project_id = project_match.group(1) if project_match else "3212"
     
     os_bridge = get_os_bridge(context)
@@ -2287,7 +2323,7 @@ def _find_latest_work_filepath(context, sc, sh, mode_tag):
     latest_file = None
 
     for f in existing_files:
-        v_match = re.search(r'-v(\d{3,})', os.path.basename(f), re.IGNORECASE)
+        v_match = VERSION_NUMBER_ICASE_PATTERN.search(os.path.basename(f))
         if v_match:
             v_num = int(v_match.group(1))
             if v_num > highest_version:
@@ -2306,7 +2342,7 @@ def _save_relink_version(context, sc, sh, mode_tag):
     name_part, ext = os.path.splitext(filename)
 
     # Find and cleanly strip any old version number to get the pure base name
-    version_match = re.search(r'-v\d{3,}', name_part, re.IGNORECASE)
+    version_match = VERSION_NUMBER_ICASE_PATTERN.search(name_part)
     if version_match:
         base_name = name_part[:version_match.start()]
     else:
@@ -2317,7 +2353,7 @@ def _save_relink_version(context, sc, sh, mode_tag):
     highest_version = -1
     
     for f in existing_files:
-        v_match = re.search(r'-v(\d{3,})', os.path.basename(f), re.IGNORECASE)
+        v_match = VERSION_NUMBER_ICASE_PATTERN.search(os.path.basename(f))
         if v_match:
             highest_version = max(highest_version, int(v_match.group(1)))
     
@@ -2326,7 +2362,7 @@ def _save_relink_version(context, sc, sh, mode_tag):
     
     clean_user = get_current_user()
 
-    project_match = re.match(r"^(\d+)-", base_name)
+    project_match = PROJECT_NUMBER_PATTERN.match(base_name)
     project_id = project_match.group(1) if project_match else "3212"
     
     new_filename = f"{project_id}-{sc.lower()}-{sh.lower()}-{mode_tag.lower()}-v{new_version_int:03d}-{clean_user}-butch_relink{ext}"
@@ -2476,8 +2512,9 @@ def _relink_ani(context, sc=None, sh=None):
 
 def get_all_butcher_shots(context):
     scene = context.scene
-    shot_markers = [m for m in scene.timeline_markers if re.match(r"CAM-SC\d+-SH\d+", m.name, re.IGNORECASE)]
-    return sorted(shot_markers, key=lambda m: m.frame)
+    shot_markers = [m for m in scene.timeline_markers if SHOT_MARKER_PATTERN.match(m.name)]
+    shot_markers.sort(key=attrgetter("frame"))
+    return shot_markers
 
 class BUTCHER_ShotListItem(bpy.types.PropertyGroup):
     name: StringProperty()
@@ -2519,7 +2556,7 @@ class BUTCHER_OT_refresh_shot_list(Operator):
         for marker in found_shots:
             item = shot_list.add()
             item.name = marker.name
-            name_match = re.match(r"CAM-(SC\d+-SH\d+)", marker.name, re.IGNORECASE)
+            name_match = SHOT_MARKER_ID_PATTERN.match(marker.name)
             if name_match:
                 item.display_name = name_match.group(1)
             else:
@@ -2654,7 +2691,7 @@ def _process_next_relink_step():
 
     shot_name = _relink_queue.pop(0)
     try:
-        match = re.match(r"CAM-(SC\d+)-(SH\d+)", shot_name, re.IGNORECASE)
+        match = SHOT_MARKER_PATTERN.match(shot_name)
         if not match: return 0.1
         sc, sh = match.group(1).upper(), match.group(2).upper()
         mode = _relink_force_mode
@@ -2824,7 +2861,7 @@ def _process_next_combo_relink_step():
     shot_name, mode = _combo_relink_queue.pop(0)
     log.info(f"--- Combo Relink Process: {shot_name} [{mode}] ---")
     try:
-        match = re.match(r"CAM-(SC\d+)-(SH\d+)", shot_name, re.IGNORECASE)
+        match = SHOT_MARKER_PATTERN.match(shot_name)
         if not match: return 0.1
         sc, sh = match.group(1).upper(), match.group(2).upper()
 
@@ -2943,6 +2980,11 @@ from bpy.app.handlers import persistent
 
 _last_butcher_scene_name = ""
 
+@persistent
+def clear_production_sc_dir_cache(dummy):
+    """load_post handler: forget resolved SC folders, which may have moved since the last file."""
+    _PRODUCTION_SC_DIR_CACHE.clear()
+
 @persistent
 def auto_refresh_butcher_shot_list(dummy):
     global _last_butcher_scene_name
@@ -2965,7 +3007,7 @@ def auto_refresh_butcher_shot_list(dummy):
         for marker in found_shots:
             item = shot_list.add()
             item.name = marker.name
-            name_match = re.match(r"CAM-(SC\d+-SH\d+)", marker.name, re.IGNORECASE)
+            name_match = SHOT_MARKER_ID_PATTERN.match(marker.name)
             if name_match:
                 item.display_name = name_match.group(1)
             else:
@@ -3085,6 +3127,8 @@ def register():
     
     if auto_refresh_butcher_shot_list not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(auto_refresh_butcher_shot_list)
+    if clear_production_sc_dir_cache not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(clear_production_sc_dir_cache)
     if auto_refresh_butcher_shot_list not in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.append(auto_refresh_butcher_shot_list)
     
@@ -3114,6 +3158,8 @@ def unregister():
         
     if auto_refresh_butcher_shot_list in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(auto_refresh_butcher_shot_list)
+    if clear_production_sc_dir_cache in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_production_sc_dir_cache)
     if auto_refresh_butcher_shot_list in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(auto_refresh_butcher_shot_list)
 
@@ -155,12 +155,11 @@ def get_workstation_id_file():
     return None
 
 # Roots to determine if a file is a "Company File"
-COMPANY_ROOTS = [
-    r"S:\3212-PREPRODUCTION",
-    r"S:\3212-PRODUCTION",
+# Forward-slash form only; is_company_file() normalizes the file path to match.
+COMPANY_ROOTS = (
     "S:/3212-PREPRODUCTION",
     "S:/3212-PRODUCTION",
-]
+)
 
 COMPANY_BOOKMARKS = [
     "S:/3212-PREPRODUCTION",
@@ -195,10 +194,8 @@ def is_company_file():
     
     # Normalize slashes for comparison
     filepath = filepath.replace("\\", "/")
-    for root in COMPANY_ROOTS:
-        clean_root = root.replace("\\", "/")
-        if filepath.startswith(clean_root):
-            return True
+    if filepath.startswith(COMPANY_ROOTS):
+        return True
 
     # Dynamic Mac check
     mac_root = get_company_root()
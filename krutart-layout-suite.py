@@ -14,6 +14,7 @@ import bpy
 import re
 import os
 import logging
+from operator import attrgetter
 from bpy.props import StringProperty, EnumProperty, BoolProperty
 from bpy.types import AddonPreferences
 from bpy.app.handlers import persistent
@@ -61,6 +62,13 @@ COLLECTION_COLORS = {
 
 CAMERA_COLLECTION_TO_APPEND = "+CAMERA+"
 
+# Precompiled name patterns (compiled once at import instead of per marker / per redraw)
+# End-anchored with \Z and possessive digit runs (Python 3.11+, bundled since Blender 4.1)
+# Matched against the upper-cased marker name, so no IGNORECASE is needed.
+SHOT_MARKER_PATTERN = re.compile(r"CAM-(SC\d++)-(SH\d++)\Z")
+SHOT_MARKER_PREFIX = "CAM-SC"
+ENV_COLLECTION_PATTERN = re.compile(r"^\+ENV-(.+)\+$")
+
 
 # --- Helper Functions ---
 
@@ -76,7 +84,7 @@ def find_view_collections_by_substring_in_collection(layer_collection, substring
 
 
 def hide_collections_in_view_layer(substring, hide=True):
-    log.info(f"Attempting to set exclude={hide} for collections containing '{substring}'.")
+    log.info("Attempting to set exclude=%s for collections containing '%s'.", hide, substring)
     view_layer_collections = find_view_collections_by_substring_in_collection(
         bpy.context.view_layer.layer_collection, substring
     )
@@ -91,19 +99,41 @@ def hide_collections_in_view_layer(substring, hide=True):
             hidden_count += 1
 
 
+def match_shot_marker(marker_name):
+    """
+    Returns the SHOT_MARKER_PATTERN match for a 'CAM-SC##-SH##' marker name, or None.
+    The name is upper-cased once, so the captured SC/SH groups are already upper case.
+    Names without the 'CAM-SC' prefix are rejected before the regex engine runs.
+    """
+    name_upper = marker_name.upper()
+    if not name_upper.startswith(SHOT_MARKER_PREFIX):
+        return None
+    return SHOT_MARKER_PATTERN.match(name_upper)
+
+
+def is_shot_scene_name(scene_name_upper):
+    """
+    True for upper-cased scene names like 'SC##-...' (the old ^SC\\d+- check),
+    using plain string tests instead of the regex engine.
+    """
+    head, sep, _ = scene_name_upper.partition("-")
+    return bool(sep) and head.startswith("SC") and head[2:].isdecimal()
+
+
 def get_or_create_collection(name, parent_collection, color_tag=None):
     created = False
-    collection = bpy.data.collections.get(name)
+    # Fast path: on re-runs the child is already linked, so one children lookup
+    # replaces the bpy.data search plus the membership test.
+    collection = parent_collection.children.get(name)
 
     if collection is None:
-        collection = bpy.data.collections.new(name)
+        collection = bpy.data.collections.get(name)
+        if collection is None:
+            collection = bpy.data.collections.new(name)
+            created = True
         parent_collection.children.link(collection)
-        created = True
-    else:
-        if name not in parent_collection.children:
-            parent_collection.children.link(collection)
 
-    if color_tag:
+    if color_tag and collection.color_tag != color_tag:
         collection.color_tag = color_tag
 
     return collection, created
@@ -147,7 +177,7 @@ def create_marker_from_strip(scene, strip):
     parsed = parse_shot_filename(filename)
     
     if not parsed:
-        log.warning(f"Could not parse SC/SH from '{filename}'. Skipping marker.")
+        log.warning("Could not parse SC/SH from '%s'. Skipping marker.", filename)
         return None
         
     sc_str, sh_str, _, _ = parsed
@@ -157,10 +187,10 @@ def create_marker_from_strip(scene, strip):
     existing = scene.timeline_markers.get(marker_name)
     if existing:
         existing.frame = strip.frame_start
-        log.info(f"Updated marker '{marker_name}' to frame {strip.frame_start}.")
+        log.info("Updated marker '%s' to frame %s.", marker_name, strip.frame_start)
     else:
         scene.timeline_markers.new(name=marker_name, frame=strip.frame_start)
-        log.info(f"Created marker '{marker_name}' at frame {strip.frame_start}.")
+        log.info("Created marker '%s' at frame %s.", marker_name, strip.frame_start)
 
 
 # --- CAMERA SWITCHER LOGIC ---
@@ -194,16 +224,15 @@ def apply_shot_camera_state(scene, update_resolution=True):
                 scene.render.resolution_y = 2048
 
     # Marker binding
+    # Cameras are indexed by name in one pass, instead of a by-name search of
+    # bpy.data.objects for every shot marker.
+    cameras_by_name = {obj.name: obj for obj in bpy.data.objects if obj.type == 'CAMERA'}
     for marker in scene.timeline_markers:
-        if marker.name.startswith("CAM-SC"):
-            shot_name = marker.name
-            target_cam_name = f"{shot_name}-{camera_suffix}"
-            target_cam_obj = bpy.data.objects.get(target_cam_name)
-            
-            if target_cam_obj and target_cam_obj.type == 'CAMERA':
+        shot_name = marker.name
+        if shot_name.startswith("CAM-SC"):
+            target_cam_obj = cameras_by_name.get(f"{shot_name}-{camera_suffix}")
+            if marker.camera != target_cam_obj:
                 marker.camera = target_cam_obj
-            else:
-                marker.camera = None
 
     if bpy.context.scene:
         on_frame_change(bpy.context.scene)
@@ -226,13 +255,15 @@ def on_frame_change(scene):
     current_frame = scene.frame_current
     active_marker = None
     
-    # Find marker for current frame
-    sorted_markers = sorted(scene.timeline_markers, key=lambda m: m.frame)
-    for marker in sorted_markers:
-        if marker.frame <= current_frame:
+    # Find marker for current frame: the latest one at or before it, in a single
+    # pass instead of sorting every marker on every frame change.
+    # ">=" keeps the last of several markers sharing a frame, as the stable sort did.
+    active_frame = None
+    for marker in scene.timeline_markers:
+        marker_frame = marker.frame
+        if marker_frame <= current_frame and (active_frame is None or marker_frame >= active_frame):
             active_marker = marker
-        else:
-            break
+            active_frame = marker_frame
             
     if active_marker and active_marker.camera:
         if scene.camera != active_marker.camera:
@@ -275,9 +306,9 @@ class SCENE_OT_create_location_structure(bpy.types.Operator):
         get_or_create_collection(f"VFX-{base_name}", loc_parent_col)
 
         for collection in bpy.data.collections:
-            if collection.name.startswith("+ENV-") and collection.name.endswith("+"):
-                if collection.name not in master_collection.children:
-                    master_collection.children.link(collection)
+            collection_name = collection.name
+            if ENV_COLLECTION_PATTERN.match(collection_name) and collection_name not in master_collection.children:
+                master_collection.children.link(collection)
 
         return {"FINISHED"}
 
@@ -342,17 +373,21 @@ class SCENE_OT_create_scene_structure(bpy.types.Operator):
         get_or_create_collection(f"VFX-{base_name}", vfx_col)
         get_or_create_collection(f"SHOT-VFX-{base_name}", vfx_col)
 
-        # Link Environment & Location
+        # Link Environment & Location (one pass finds both)
         linked_enviros = []
+        location_collection = None
         for collection in bpy.data.collections:
-            enviro_match = re.match(r"^\+ENV-(.+)\+$", collection.name)
+            collection_name = collection.name
+            if location_collection is None and collection_name.startswith("+LOC-"):
+                location_collection = collection
+                continue
+            enviro_match = ENV_COLLECTION_PATTERN.match(collection_name)
             if enviro_match:
                 enviro_name = enviro_match.group(1)
-                if enviro_name in scene_env_name and collection.name not in master_collection.children:
+                if enviro_name in scene_env_name and collection_name not in master_collection.children:
                     master_collection.children.link(collection)
-                    linked_enviros.append(collection.name)
+                    linked_enviros.append(collection_name)
 
-        location_collection = next((c for c in bpy.data.collections if c.name.startswith("+LOC-")), None)
         if location_collection and location_collection.name not in master_collection.children:
             master_collection.children.link(location_collection)
 
@@ -383,10 +418,10 @@ class SCENE_OT_verify_shot_collections(bpy.types.Operator):
         existing_shot_collections = set(shot_ani_collection.children.keys())
 
         for marker in scene.timeline_markers:
-            match = re.match(r"CAM-(SC\d+)-(SH\d+)$", marker.name, re.IGNORECASE)
+            match = match_shot_marker(marker.name)
             if match:
-                sc_id, sh_id = match.groups()
-                expected_collection_name = f"CAM-{sc_id.upper()}-{sh_id.upper()}"
+                sc_upper, sh_upper = match.groups()
+                expected_collection_name = f"CAM-{sc_upper}-{sh_upper}"
                 if expected_collection_name not in existing_shot_collections:
                     missing_collections.append(expected_collection_name)
 
@@ -536,7 +571,7 @@ class SEQUENCER_OT_import_animatic_guides(bpy.types.Operator):
              return {"CANCELLED"}
         
         target_sc_str = init_parsed[0]  # e.g. "SC04"
-        log.info(f"Targeting Scene ID: {target_sc_str}")
+        log.info("Targeting Scene ID: %s", target_sc_str)
 
         # --- PRODUCTION DETECTION & SINGLE SHOT FILTER ---
         is_prod = is_production_project()
@@ -546,7 +581,7 @@ class SEQUENCER_OT_import_animatic_guides(bpy.types.Operator):
             sh_match = re.search(r"SH(\d+)", scene.name, re.IGNORECASE)
             if sh_match:
                 target_sh_str = f"SH{sh_match.group(1).upper()}"
-                log.info(f"Production detected via path. Target shot from scene name: {target_sh_str}")
+                log.info("Production detected via path. Target shot from scene name: %s", target_sh_str)
             else:
                 log.info("Production detected via path, but no SH ID found in scene name. Importing all guides at 1001.")
         # -------------------------------------------------
@@ -586,7 +621,7 @@ class SEQUENCER_OT_import_animatic_guides(bpy.types.Operator):
              return {"CANCELLED"}
              
         sorted_shot_nums = sorted(shots_map.keys())
-        log.info(f"Found {len(sorted_shot_nums)} shots to import: {sorted_shot_nums}")
+        log.info("Found %s shots to import: %s", len(sorted_shot_nums), sorted_shot_nums)
 
         # 3. Clean Setup (Remove OLD Guides & Markers)
         
@@ -618,7 +653,7 @@ class SEQUENCER_OT_import_animatic_guides(bpy.types.Operator):
         
         for s in strips_to_remove:
             scene.sequence_editor.sequences.remove(s)
-        log.info(f"Removed {len(strips_to_remove)} old guide strips.")
+        log.info("Removed %s old guide strips.", len(strips_to_remove))
 
         # B. Remove Markers (Safe removal: only matches CAM-SCxx pattern)
         markers_to_remove = []
@@ -628,7 +663,7 @@ class SEQUENCER_OT_import_animatic_guides(bpy.types.Operator):
                 
         for m in markers_to_remove:
             scene.timeline_markers.remove(m)
-        log.info(f"Removed {len(markers_to_remove)} old markers.")
+        log.info("Removed %s old markers.", len(markers_to_remove))
 
         # 4. Build Timeline (Deterministic Loop)
         current_frame = 1001 if is_prod else 1
@@ -683,10 +718,10 @@ class SEQUENCER_OT_import_animatic_guides(bpy.types.Operator):
                         # Advance Frame based on ACTUAL imported length
                         current_frame += int(video_strip.frame_final_duration)
                     else:
-                        log.warning(f"Imported {filename} but could not locate strip via selection.")
+                        log.warning("Imported %s but could not locate strip via selection.", filename)
 
                 except Exception as e:
-                      log.error(f"Error importing {filename}: {e}")
+                      log.error("Error importing %s: %s", filename, e)
 
         # 5. Finalize
         scene.frame_start = 1001 if is_prod else 1
@@ -755,17 +790,19 @@ class SCENE_OT_setup_cameras_from_markers(bpy.types.Operator):
              return {"CANCELLED"}
 
         camera_offset_counter = 0
-        for marker in sorted(markers, key=lambda m: m.frame):
-            match = re.match(r"CAM-(SC\d+)-(SH\d+)$", marker.name, re.IGNORECASE)
+        pending_shots = []
+        existing_camera_collections = set(shot_ani_collection.children.keys())
+        sorted_markers = sorted(markers, key=attrgetter("frame"))
+        for marker in sorted_markers:
+            match = match_shot_marker(marker.name)
             if not match: continue
 
-            sc_id, sh_id = match.groups()
-            sc_upper, sh_upper = sc_id.upper(), sh_id.upper()
+            sc_upper, sh_upper = match.groups()
             
             cam_collection_name = f"CAM-{sc_upper}-{sh_upper}"
             
             # SKIP if already exists
-            if cam_collection_name in shot_ani_collection.children:
+            if cam_collection_name in existing_camera_collections:
                 camera_offset_counter += 1 # Still increment to keep spacing consistent if we were creating
                 continue
 
@@ -773,42 +810,61 @@ class SCENE_OT_setup_cameras_from_markers(bpy.types.Operator):
             get_or_create_collection(f"MODEL-{sc_upper}-{sh_upper}", shot_art_collection)
             get_or_create_collection(f"VFX-{sc_upper}-{sh_upper}", shot_vfx_collection)
 
-            # Append Camera Rig
+            pending_shots.append((marker.name, sc_upper, sh_upper, camera_offset_counter))
+            existing_camera_collections.add(cam_collection_name)
+            camera_offset_counter += 1
+
+        # New camera collections are staged and linked into SHOT-ANI in one pass after
+        # their internals are renamed, so renames happen while they are still unlinked.
+        staged_camera_collections = []
+        for marker_name, sc_upper, sh_upper, camera_offset in pending_shots:
+            cam_collection_name = f"CAM-{sc_upper}-{sh_upper}"
             try:
+                # Append Camera Rig once per shot: a fresh append gives every shot its own
+                # complete rig (actions, drivers and all ID pointers), independent of the others.
                 with bpy.data.libraries.load(camera_hero_blend_path, link=False) as (data_from, data_to):
-                    data_to.collections = [c for c in data_from.collections if c == CAMERA_COLLECTION_TO_APPEND]
-
-                if data_to.collections:
-                    appended_col = data_to.collections[0]
-                    appended_col.name = cam_collection_name
-                    shot_ani_collection.children.link(appended_col)
-                    appended_col.color_tag = COLLECTION_COLORS["CAMERA"]
-
-                    # Rename internals
-                    for child in appended_col.children:
-                        if "cam_mesh" in child.name:
-                            child.name = f"cam_mesh-{sc_upper}-{sh_upper}"
-                            for obj in child.objects:
-                                if "cam_flat" in obj.name: obj.name = f"CAM-{sc_upper}-{sh_upper}-FLAT"
-                                elif "cam_fulldome" in obj.name: obj.name = f"CAM-{sc_upper}-{sh_upper}-FULLDOME"
-                        elif "cam_rig" in child.name:
-                            child.name = f"cam_rig-{sc_upper}-{sh_upper}"
-                            for obj in child.objects:
-                                if obj.type == "ARMATURE":
-                                    obj.name = f"+cam_rig-{sc_upper}-{sh_upper}"
-                                    # Offset
-                                    obj.location.x += (camera_offset_counter * 2.0)
-                        elif "cam_boneshapes" in child.name:
-                            child.name = f"cam_boneshapes-{sc_upper}-{sh_upper}"
-
-                    # Cleanup root link
-                    if appended_col.name in scene.collection.children:
-                        scene.collection.children.unlink(appended_col)
-                    
-                    camera_offset_counter += 1
+                    if CAMERA_COLLECTION_TO_APPEND in data_from.collections:
+                        data_to.collections = [CAMERA_COLLECTION_TO_APPEND]
+
+                if not data_to.collections:
+                    continue
+                appended_col = data_to.collections[0]
+                appended_col.name = cam_collection_name
+                appended_col.color_tag = COLLECTION_COLORS["CAMERA"]
+                staged_camera_collections.append(appended_col)
+
+                # Rename internals (snapshot RNA collections into locals once)
+                shot_suffix = f"{sc_upper}-{sh_upper}"
+                x_offset = camera_offset * 2.0
+                for child in list(appended_col.children):
+                    child_name = child.name
+                    if "cam_mesh" in child_name:
+                        child.name = f"cam_mesh-{shot_suffix}"
+                        for obj in list(child.objects):
+                            obj_name = obj.name
+                            if "cam_flat" in obj_name: obj.name = f"CAM-{shot_suffix}-FLAT"
+                            elif "cam_fulldome" in obj_name: obj.name = f"CAM-{shot_suffix}-FULLDOME"
+                    elif "cam_rig" in child_name:
+                        child.name = f"cam_rig-{shot_suffix}"
+                        for obj in list(child.objects):
+                            if obj.type == "ARMATURE":
+                                obj.name = f"+cam_rig-{shot_suffix}"
+                                # Offset
+                                location = obj.location
+                                location.x += x_offset
+                    elif "cam_boneshapes" in child_name:
+                        child.name = f"cam_boneshapes-{shot_suffix}"
 
             except Exception as e:
-                log.error(f"Error appending camera for {marker.name}: {e}")
+                log.error("Error appending camera for %s: %s", marker_name, e)
+
+        scene_root_children = scene.collection.children
+        scene_root_names = set(scene_root_children.keys())
+        for appended_col in staged_camera_collections:
+            shot_ani_collection.children.link(appended_col)
+            # Cleanup root link
+            if appended_col.name in scene_root_names:
+                scene_root_children.unlink(appended_col)
 
         hide_collections_in_view_layer("cam_boneshapes", hide=True)
         # Ensure we bind cameras, but DO NOT force resolution change just by running setup
@@ -827,19 +883,19 @@ class VIEW3D_PT_layout_suite_main_panel(bpy.types.Panel):
     def draw(self, context):
         layout = self.layout
         scene = context.scene
-        scene_name = scene.name
+        scene_name_upper = scene.name.upper()
 
-        if re.match(r"^LOC-", scene_name, re.IGNORECASE):
+        if scene_name_upper.startswith("LOC-"):
             box = layout.box()
             box.label(text="Location Tools", icon="WORLD_DATA")
             box.operator(SCENE_OT_create_location_structure.bl_idname)
 
-        elif re.match(r"^ENV-", scene_name, re.IGNORECASE):
+        elif scene_name_upper.startswith("ENV-"):
             box = layout.box()
             box.label(text="Environment Tools", icon="OUTLINER_OB_LIGHTPROBE")
             box.operator(SCENE_OT_create_enviro_structure.bl_idname)
 
-        elif re.match(r"^SC\d+-", scene_name, re.IGNORECASE):
+        elif is_shot_scene_name(scene_name_upper):
             box = layout.box()
             box.label(text="Initial Scene Setup", icon="SCENE_DATA")
             box.operator(SCENE_OT_create_scene_structure.bl_idname)
@@ -33,6 +33,14 @@ DAB_CSV_URL = f"https://docs.google.com/spreadsheets/d/{DAB_SPREADSHEET_ID}/expo
 # WebApp URLs - Default fallback values
 DEFAULT_SHOTLIST_URL = "https://script.google.com/macros/s/AKfycbxJm8DPQ9hw5CRg9pgsbQMEyPzl9eTVu8LFaPPUzPfx5EF5zDfL4o8apxzUXS02wShTxQ/exec"
 
+# Precompiled name/path patterns used by the publish path mapping
+UNSAFE_NAME_CHARS_PATTERN = re.compile(r'[^a-zA-Z0-9_-]')
+SHOT_ASSET_PATTERN = re.compile(r"(sc\d+)-(sh\d+)", re.IGNORECASE)
+VERSION_FLAG_PATTERN = re.compile(r'-v(\d{3,})')
+WORK_FOLDER_SUFFIX_PATTERN = re.compile(r'-work\b', re.IGNORECASE)
+LIBRARY_WORK_PATTERN = re.compile(r'LIBRARY-WORK', re.IGNORECASE)
+TEX_SOURCE_FLAG_PATTERN = re.compile(r'-(mod|act|prp)-', re.IGNORECASE)
+
 # Global cache for dashboard data
 CACHED_DASH_DATA = {}
 DASH_FETCH_STATUS = "Ready"
@@ -98,7 +106,7 @@ def get_current_user():
         user_name = socket.gethostname().lower()
 
     if user_name:
-        return re.sub(r'[^a-zA-Z0-9_-]', '_', user_name)
+        return UNSAFE_NAME_CHARS_PATTERN.sub('_', user_name)
     
     return "user"
 
@@ -228,7 +236,7 @@ def upload_publisher_data(context, filepath, comment):
     
     # Determine Project Type
     project_type = "Asset"
-    if asset and re.search(r"sc\d+-sh\d+", asset, re.IGNORECASE):
+    if asset and SHOT_ASSET_PATTERN.search(asset):
         project_type = "Shot"
     
     user_name = get_current_user()
@@ -305,7 +313,7 @@ def parse_filename(filepath):
     name_lower = name.lower()
     
     # Find the version number flag, e.g., "-v001"
-    version_match = re.search(r'-v(\d{3,})', name_lower)
+    version_match = VERSION_FLAG_PATTERN.search(name_lower)
     
     if not version_match:
         logger.warning(f"Filename '{name}' does not contain a version flag like '-v###'.")
@@ -322,7 +330,7 @@ def parse_filename(filepath):
     
     # --- MODIFIED LOGIC (v1.7.0): Shot Naming Support ---
     # Try SC-SH format: 3212-SC11-SH080-flags-v001
-    shot_match = re.search(r"(sc\d+)-(sh\d+)", before_version_part, re.IGNORECASE)
+    shot_match = SHOT_ASSET_PATTERN.search(before_version_part)
     
     if shot_match:
         # It's a shot file
@@ -416,7 +424,7 @@ class KRUTART_OT_save_increment(bpy.types.Operator):
             base_name = f"{project}-{asset}-{new_version_str}"
         
         # Sanitize comment for filename
-        sanitized_comment = re.sub(r'[^a-zA-Z0-9_-]', '_', comment)
+        sanitized_comment = UNSAFE_NAME_CHARS_PATTERN.sub('_', comment)
         
         # --- NEW LOGIC (v1.6.1): Insert User Name ---
         user_name = get_current_user()
@@ -548,7 +556,7 @@ class KRUTART_OT_make_hero(bpy.types.Operator):
             shot_root_dir = None
             
             # asset_name from parse_filename for shots is "scxx-shxxx"
-            if parsed_asset and re.search(r"sc\d+-sh\d+", parsed_asset, re.IGNORECASE):
+            if parsed_asset and SHOT_ASSET_PATTERN.search(parsed_asset):
                 # Search for the Shot Root folder in the path
                 for i, p in enumerate(path_parts):
                     if p.lower().startswith(parsed_asset.lower()):
@@ -566,7 +574,7 @@ class KRUTART_OT_make_hero(bpy.types.Operator):
                     # 2. Global replacement for generic assets
                     # Replaces every instance of '-WORK' (case-insensitive) at the end of a folder name with '-HERO'
                     # e.g., LIBRARY-WORK\MODEL-WORK -> LIBRARY-HERO\MODEL-HERO
-                    hero_asset_dir_prod = re.sub(r'-work\b', '-HERO', work_dir_prod, flags=re.IGNORECASE)
+                    hero_asset_dir_prod = WORK_FOLDER_SUFFIX_PATTERN.sub('-HERO', work_dir_prod)
                     logger.debug(f"Asset detected. Using global transformation: {hero_asset_dir_prod}")
                 else:
                     hero_asset_dir_prod = ""
@@ -592,9 +600,11 @@ class KRUTART_OT_make_hero(bpy.types.Operator):
 
             logger.info(f"Transformed WORK path '{work_dir}' to HERO path '{hero_asset_dir_path}'")
 
-            if not os.path.exists(hero_asset_dir_path):
-                logger.info(f"Creating missing hero directory: {hero_asset_dir_path}")
-                os.makedirs(hero_asset_dir_path, exist_ok=True)
+            try:
+                os.makedirs(hero_asset_dir_path)
+                logger.info(f"Created missing hero directory: {hero_asset_dir_path}")
+            except FileExistsError:
+                pass
 
             # Conditionally add flags to hero filename
             if flags:
@@ -700,7 +710,7 @@ class KRUTART_OT_make_hero(bpy.types.Operator):
             else:
                 base_name = f"{project}-{asset}-{new_version_str}"
             
-            sanitized_comment = re.sub(r'[^a-zA-Z0-9_-]', '_', comment)
+            sanitized_comment = UNSAFE_NAME_CHARS_PATTERN.sub('_', comment)
             
             # --- NEW LOGIC (v1.6.1): Insert User Name ---
             user_name = get_current_user()
@@ -785,7 +795,7 @@ class KRUTART_OT_send_to_tex_paint(bpy.types.Operator):
             filename = os.path.basename(src_path)
             
             # Find the LIBRARY-WORK root
-            match = re.search(r'LIBRARY-WORK', dir_name, re.IGNORECASE)
+            match = LIBRARY_WORK_PATTERN.search(dir_name)
             if not match:
                 self.report({'ERROR'}, "Could not identify 'LIBRARY-WORK' in path.")
                 return {'CANCELLED'}
@@ -835,10 +845,10 @@ class KRUTART_OT_send_to_tex_paint(bpy.types.Operator):
             # Filename transformation
             name_no_ext, ext = os.path.splitext(filename)
             # Replace first occurrence of -mod-, -act-, -prp- with -tex-
-            new_name = re.sub(r'-(mod|act|prp)-', '-tex-', name_no_ext, count=1, flags=re.IGNORECASE)
+            new_name = TEX_SOURCE_FLAG_PATTERN.sub('-tex-', name_no_ext, count=1)
             
             # Find version string -v###
-            version_match = re.search(r'-v(\d{3,})', new_name)
+            version_match = VERSION_FLAG_PATTERN.search(new_name)
             if not version_match:
                 self.report({'ERROR'}, "Could not identify version in filename.")
                 return {'CANCELLED'}
@@ -850,11 +860,12 @@ class KRUTART_OT_send_to_tex_paint(bpy.types.Operator):
             if os.path.exists(final_dir):
                 # Search for files that match the PROJECT-tex-NAME-v### pattern
                 # This ensures we don't overwrite if the asset was sent before
-                search_pattern = f"{re.escape(before_version)}-v(\d{{3}})"
-                for f in os.listdir(final_dir):
-                    m = re.search(search_pattern, f, re.IGNORECASE)
-                    if m:
-                        existing_versions.append(int(m.group(1)))
+                search_pattern = re.compile(f"{re.escape(before_version)}-v(\d{{3}})", re.IGNORECASE)
+                with os.scandir(final_dir) as entries:
+                    for entry in entries:
+                        m = search_pattern.search(entry.name)
+                        if m:
+                            existing_versions.append(int(m.group(1)))
             
             next_version = max(existing_versions) + 1
             version_str = f"v{next_version:03d}"
@@ -864,7 +875,7 @@ class KRUTART_OT_send_to_tex_paint(bpy.types.Operator):
             # Construct new filename with user and comment
             comment = context.scene.krutart_comment.strip() or "tex publish"
             user = get_current_user()
-            sanitized_comment = re.sub(r'[^a-zA-Z0-9_-]', '_', comment)
+            sanitized_comment = UNSAFE_NAME_CHARS_PATTERN.sub('_', comment)
             
             final_filename = f"{before_version}-{version_str}-{user}-{sanitized_comment}{ext}".lower()
             dst_path = os.path.join(final_dir, final_filename)
@@ -877,9 +888,11 @@ class KRUTART_OT_send_to_tex_paint(bpy.types.Operator):
 
         # 3. Create folders and Copy
         try:
-            if not os.path.exists(final_dir):
-                os.makedirs(final_dir, exist_ok=True)
+            try:
+                os.makedirs(final_dir)
                 logger.info(f"Step 3: Created target directory: {final_dir}")
+            except FileExistsError:
+                pass
             
             shutil.copy2(src_path, dst_path)
             logger.info(f"Step 3: File copied to target.")
@@ -18,6 +18,7 @@ bl_info = {
 
 import bpy
 import os
+import re
 import sys
 import threading
 import queue
@@ -40,6 +41,13 @@ COL_GENERAL = 'general_value'
 COL_ANI = 'ani_value'         
 COL_ART = 'art_value'         
 
+EMPTY_CELL_VALUES = frozenset(('-', ''))
+TRUE_CELL_VALUES = frozenset(('true', 'yes', 'on'))
+FALSE_CELL_VALUES = frozenset(('false', 'no', 'off'))
+BOOLEAN_TRUE_VALUES = frozenset(('true', '1', 'yes', 'on', 'enable'))
+# Plain decimal / scientific numbers. Used to reject text cells without raising ValueError.
+NUMBER_CELL_PATTERN = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+
 execution_queue = queue.Queue()
 
 # -------------------------------------------------------------------------------------------------
@@ -68,40 +76,37 @@ def get_rna_property_type(obj, attr_name):
 def robust_cast(value_str, target_obj, attr_name):
     if value_str is None:
         return None
-    val_str = str(value_str).strip()
-    if val_str in ['-', '']:
+    # CSV cells are already str; only convert foreign types
+    val_str = (value_str if isinstance(value_str, str) else str(value_str)).strip()
+    if val_str in EMPTY_CELL_VALUES:
         return None
 
+    val_lower = val_str.lower()
     rna_type = get_rna_property_type(target_obj, attr_name)
     
     if rna_type:
         try:
             if rna_type == 'BOOLEAN':
-                return val_str.lower() in ('true', '1', 'yes', 'on', 'enable')
+                return val_lower in BOOLEAN_TRUE_VALUES
             elif rna_type == 'INT':
                 return int(float(val_str))
             elif rna_type == 'FLOAT':
                 return float(val_str)
-            elif rna_type == 'ENUM':
-                return str(val_str)
-            elif rna_type == 'STRING':
-                return str(val_str)
+            elif rna_type == 'ENUM' or rna_type == 'STRING':
+                return val_str
         except ValueError:
             print(f"[Krutart] Warning: Could not cast '{val_str}' to {rna_type} for {attr_name}. Attempting fallback.")
 
-    val_lower = val_str.lower()
-    if val_lower in ('true', 'yes', 'on'): return True
-    if val_lower in ('false', 'no', 'off'): return False
+    if val_lower in TRUE_CELL_VALUES: return True
+    if val_lower in FALSE_CELL_VALUES: return False
     
-    try:
+    if NUMBER_CELL_PATTERN.fullmatch(val_str):
         f_val = float(val_str)
         if f_val.is_integer():
             return int(f_val)
         return f_val
-    except ValueError:
-        pass 
         
-    return str(val_str)
+    return val_str
 
 # -------------------------------------------------------------------------------------------------
 # PUBLIC SHEET CSV CLIENT (No Dependencies)